@@ -0,0 +1,87 @@
+"""Latency of fuzzy lookups of deep analysis: Levenshtein automaton over the trie vs. the deletion index
+
+The trie backend requires dependencies of deep analysis.
+
+Run: python -m benchmarks.bench_fuzzy
+"""
+import random
+from math import floor
+from timeit import timeit
+
+from profanity_filter.deletion_index import DeletionIndex
+from profanity_filter.profanity_filter import ProfanityFilter
+
+FILLER_WORDS = ('hello', 'world', 'awesome', 'chocolate', 'weather', 'profanity', 'filter', 'yesterday')
+LOOKUPS = 1000
+MAX_DISTANCE = 3
+
+
+def distort(word: str) -> str:
+    chars = list(word)
+    position = random.randrange(len(chars))
+    operation = random.choice(('insert', 'delete', 'replace'))
+    if operation == 'insert':
+        chars.insert(position, random.choice(word))
+    elif operation == 'delete' and len(chars) > 1:
+        del chars[position]
+    else:
+        chars[position] = random.choice('aeiou*1')
+    return ''.join(chars)
+
+
+def get_tolerance(word: str) -> int:
+    return min(MAX_DISTANCE, floor(0.34 * len(word)))
+
+
+def main():
+    random.seed(0)
+    pf = ProfanityFilter()
+    # noinspection PyProtectedMember
+    pf._load_profane_word_dictionaries()
+    # noinspection PyProtectedMember
+    words = list(pf._censor_dictionaries['en'])
+    queries = [distort(random.choice(words)) if random.random() < 0.5 else random.choice(FILLER_WORDS)
+               for _ in range(LOOKUPS)]
+    print(f'{"backend":>8} {"build, ms":>10} {"lookup, us":>11}')
+
+    try:
+        from profanity_filter.analysis.deep import LevenshteinAutomaton, Trie, trie_automaton_intersection
+        from profanity_filter.analysis.deep import generate_automaton_to_file
+    except ImportError:
+        print(f'{"trie":>8} {"n/a":>10} {"n/a":>11}')
+    else:
+        for distance in range(MAX_DISTANCE + 1):
+            generate_automaton_to_file(distance)
+        alphabet = set()
+        trie = None
+
+        def build_trie():
+            nonlocal trie
+            trie = Trie(words=words, alphabet=alphabet)
+
+        def lookup_trie():
+            for query in queries:
+                automaton = LevenshteinAutomaton(tolerance=get_tolerance(query), query_word=query, alphabet=alphabet)
+                trie_automaton_intersection(automaton=automaton, trie=trie, include_error=False)
+
+        build = timeit(build_trie, number=1)
+        lookup = timeit(lookup_trie, number=1) / LOOKUPS
+        print(f'{"trie":>8} {build * 1e3:>10.0f} {lookup * 1e6:>11.1f}')
+
+    index = None
+
+    def build_index():
+        nonlocal index
+        index = DeletionIndex(words=words, max_distance=MAX_DISTANCE)
+
+    def lookup_index():
+        for query in queries:
+            index.lookup(query, max_distance=get_tolerance(query))
+
+    build = timeit(build_index, number=1)
+    lookup = timeit(lookup_index, number=1) / LOOKUPS
+    print(f'{"symspell":>8} {build * 1e3:>10.0f} {lookup * 1e6:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Import time, construction time and first-call latency of `ProfanityFilter`
+
+Every measurement runs in a fresh interpreter, so nothing is imported or loaded in advance.
+
+Run: python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+from statistics import median
+
+RUNS = 5
+SCRIPT = '''
+from time import perf_counter
+start = perf_counter()
+from profanity_filter import ProfanityFilter
+imported = perf_counter()
+pf = ProfanityFilter(languages={languages!r})
+created = perf_counter()
+pf.censor("That's bullshit!")
+censored = perf_counter()
+pf.censor("That's awesome!")
+print(imported - start, created - imported, censored - created, perf_counter() - censored)
+'''
+LANGUAGES = (['en'], ['en', 'ru'])
+
+
+def measure(languages: list) -> list:
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT.format(languages=languages)],
+                                     universal_newlines=True)
+    return [float(value) for value in output.split()]
+
+
+def main():
+    print(f'{"languages":>9} {"import, ms":>10} {"create, ms":>10} {"first call, ms":>14} {"second call, ms":>15}')
+    for languages in LANGUAGES:
+        runs = [measure(languages) for _ in range(RUNS)]
+        import_time, create_time, first_call_time, second_call_time = (median(values) * 1000 for values in zip(*runs))
+        print(f'{",".join(languages):>9} {import_time:>10.0f} {create_time:>10.0f} {first_call_time:>14.0f} '
+              f'{second_call_time:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
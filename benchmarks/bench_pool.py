@@ -0,0 +1,53 @@
+"""Throughput of `ProfanityFilterPool` depending on the number of worker processes
+
+Run: python -m benchmarks.bench_pool
+"""
+import random
+from pathlib import Path
+from time import perf_counter
+
+from profanity_filter import ProfanityFilter
+
+DATA_DIR = Path(__file__).absolute().parent.parent / 'profanity_filter' / 'data'
+FILLER_WORDS = {
+    'en': 'the quick brown fox jumps over lazy dog while we are watching movies tonight'.split(),
+    'ru': 'быстрая коричневая лиса прыгает через ленивую собаку пока мы смотрим кино'.split(),
+}
+PROCESSES = (1, 2, 4, 8)
+TEXTS_COUNT = 20000
+WORDS_PER_TEXT = 12
+PROFANE_TEXTS_SHARE = 0.1
+
+
+def generate_texts(language: str) -> list:
+    with open(str(DATA_DIR / f'{language}_profane_words.txt')) as f:
+        profane_words = [line.strip() for line in f]
+    texts = []
+    for _ in range(TEXTS_COUNT):
+        words = random.choices(FILLER_WORDS[language], k=WORDS_PER_TEXT)
+        if random.random() < PROFANE_TEXTS_SHARE:
+            words[random.randrange(WORDS_PER_TEXT)] = random.choice(profane_words)
+        # Unique suffix defeats word caches, so every text is analyzed
+        texts.append(' '.join(words) + f' x{random.getrandbits(32):x}')
+    return texts
+
+
+def main():
+    random.seed(0)
+    print(f'{"language":>8} {"processes":>9} {"texts/s":>9} {"speedup":>7}')
+    for language in ('en', 'ru'):
+        texts = generate_texts(language)
+        base_throughput = None
+        for processes in PROCESSES:
+            pf = ProfanityFilter(languages=[language, 'en'])
+            with pf.pool(processes=processes, chunk_size=500) as pool:
+                start = perf_counter()
+                pool.censor_many(texts)
+                throughput = len(texts) / (perf_counter() - start)
+            if base_throughput is None:
+                base_throughput = throughput
+            print(f'{language:>8} {processes:>9} {throughput:>9.0f} {throughput / base_throughput:>7.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Latency of `ProfanityFilter._has_no_profanity` lookups depending on the size of the cache
+
+Run: python -m benchmarks.bench_substring_index
+"""
+import random
+import string
+from timeit import timeit
+
+from profanity_filter.substring_index import SubstringIndex
+
+SIZES = (1000, 10000, 100000)
+LOOKUPS = 1000
+
+
+def random_word(min_length: int = 3, max_length: int = 12) -> str:
+    return ''.join(random.choices(string.ascii_lowercase, k=random.randint(min_length, max_length)))
+
+
+def main():
+    random.seed(0)
+    queries = [random_word() for _ in range(LOOKUPS)]
+    print(f'{"cache size":>10} {"set scan, us":>14} {"index, us":>10}')
+    for size in SIZES:
+        words = {random_word() for _ in range(size)}
+        index = SubstringIndex(words)
+        set_scan = timeit(lambda: [any(query in word for word in words) for query in queries[:10]], number=1) / 10
+        indexed = timeit(lambda: [index.contains_substring(query) for query in queries], number=1) / LOOKUPS
+        print(f'{size:>10} {set_scan * 1e6:>14.1f} {indexed * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Number of parts of long words passed to deep analysis and time spent on filtering them by length and bigrams
+
+Run: python -m benchmarks.bench_substrings
+"""
+import random
+from math import floor
+from timeit import timeit
+
+from profanity_filter.bigram_index import BigramIndex
+from profanity_filter.profanity_filter import ProfanityFilter
+
+FILLER_WORDS = ('love', 'this', 'beautiful', 'weather', 'yesterday', 'awesome', 'dude', 'police', 'officer', 'game')
+LENGTHS = (10, 20, 40, 80)
+WORDS = 100
+
+
+def get_max_distance(length: int) -> int:
+    return min(3, floor(0.34 * length))
+
+
+def make_hashtag(words: list, length: int) -> str:
+    result = ''
+    while len(result) < length:
+        result += random.choice(words) if random.random() < 0.2 else random.choice(FILLER_WORDS)
+    return result[:length]
+
+
+def main():
+    random.seed(0)
+    pf = ProfanityFilter()
+    # noinspection PyProtectedMember
+    pf._load_profane_word_dictionaries()
+    # noinspection PyProtectedMember
+    words = list(pf._censor_dictionaries['en'])
+    index = BigramIndex(words)
+    print(f'{"length":>6} {"substrings":>10} {"candidates":>10} {"filter, ms":>10}')
+    for length in LENGTHS:
+        hashtags = [make_hashtag(words, length) for _ in range(WORDS)]
+        candidates = sum(len(index.find_candidates(hashtag, get_max_distance=get_max_distance))
+                         for hashtag in hashtags) / WORDS
+        elapsed = timeit(lambda: [index.find_candidates(hashtag, get_max_distance=get_max_distance)
+                                  for hashtag in hashtags], number=1) / WORDS
+        print(f'{length:>6} {length * (length + 1) // 2:>10} {candidates:>10.0f} {elapsed * 1e3:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from profanity_filter.console import main
 from profanity_filter.profanity_filter import AVAILABLE_ANALYSES, ProfanityFilter, __version__, APP_NAME, DEFAULT_CONFIG
+from profanity_filter.pool import ProfanityFilterPool
 from profanity_filter.spacy_component import SpacyProfanityFilterComponent
-from profanity_filter.types_ import ProfanityFilterError, Word
+from profanity_filter.types_ import CensoredSpan, CensoredText, ProfanityFilterError, Word
 from profanity_filter.config import Config
@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class AhoCorasickAutomaton:
+    """Finds all occurrences of dictionary words in a text in one pass (case insensitive)"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lengths of dictionary words ending in the state (including ones reachable by failure links)
+        self._output: List[Tuple[int, ...]] = [()]
+        self._words_count = 0
+        for word in words:
+            self._add_word(word)
+        self._build()
+
+    def __len__(self) -> int:
+        return self._words_count
+
+    def _add_word(self, word: str) -> None:
+        word = word.lower()
+        if not word:
+            return
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if len(word) not in self._output[state]:
+            self._output[state] += (len(word), )
+            self._words_count += 1
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int]]:
+        """Yields (start, finish) of every dictionary word occurrence in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, char in enumerate(text):
+            char = char.lower()
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in output[state]:
+                yield i + 1 - length, i + 1
+
+    def has_match(self, text: str) -> bool:
+        return next(iter(self.iter_matches(text)), None) is not None
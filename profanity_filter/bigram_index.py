@@ -0,0 +1,75 @@
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+
+class BigramIndex:
+    """Finds parts of text that may be within the Levenshtein distance from any of words (q-gram filter)
+
+    A string within distance `d` from the word has length within `d` from the word's length and shares at least
+    `max(len(string), len(word)) - 1 - 2 * d` bigrams with it, so the rest of parts can be skipped without computing
+    the distance.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._words: Set[str] = set()
+        self._bigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._lengths: Counter = Counter()
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str) -> None:
+        if word in self._words:
+            return
+        self._words.add(word)
+        self._lengths[len(word)] += 1
+        for bigram in self._get_bigrams(word):
+            self._bigrams[bigram].add(word)
+
+    def remove(self, word: str) -> None:
+        if word not in self._words:
+            return
+        self._words.remove(word)
+        self._lengths[len(word)] -= 1
+        if not self._lengths[len(word)]:
+            del self._lengths[len(word)]
+        for bigram in self._get_bigrams(word):
+            words = self._bigrams[bigram]
+            words.discard(word)
+            if not words:
+                del self._bigrams[bigram]
+
+    def find_candidates(self, text: str, get_max_distance: Callable[[int], int]) -> Set[Tuple[int, int]]:
+        """:return: (start, finish) of parts of text that may be within `get_max_distance(len(part))` from words"""
+        result = set()
+        if not self._lengths:
+            return result
+        max_length = max(self._lengths)
+        for start in range(len(text)):
+            # Number of bigrams of the part contained in every word having any of them
+            shared_bigrams = Counter()
+            # Max number of shared bigrams among words of every length
+            max_shared_bigrams = Counter()
+            for finish in range(start + 1, len(text) + 1):
+                length = finish - start
+                max_distance = get_max_distance(length)
+                # Length minus max distance doesn't decrease as the part grows
+                if length - max_distance > max_length:
+                    break
+                for word in self._bigrams.get(text[finish - 2:finish], ()) if length > 1 else ():
+                    shared_bigrams[word] += 1
+                    max_shared_bigrams[len(word)] = max(max_shared_bigrams[len(word)], shared_bigrams[word])
+                if any(word_length in self._lengths
+                       and max_shared_bigrams[word_length] >= max(length, word_length) - 1 - 2 * max_distance
+                       for word_length in range(length - max_distance, length + max_distance + 1)):
+                    result.add((start, finish))
+        return result
+
+    @staticmethod
+    def _get_bigrams(word: str) -> Set[str]:
+        return {word[i:i + 2] for i in range(len(word) - 1)}
@@ -0,0 +1,310 @@
+import csv
+import glob
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from time import monotonic
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from profanity_filter.profanity_filter import ProfanityFilter, DEFAULT_BATCH_SIZE
+from profanity_filter.types_ import PathOrStr, ProfanityFilterError
+
+
+# Records are read as (text, context), where context is whatever the writer needs to write the result
+Record = Tuple[str, Any]
+
+
+class Checkpoint:
+    """Number of records written and position of the output file after them, saved atomically"""
+
+    def __init__(self, path: Optional[PathOrStr]):
+        self._path = None if path is None else Path(path)
+        self.records = 0
+        self.output_offset = 0
+        if self._path is not None and self._path.is_file():
+            with open(str(self._path)) as f:
+                checkpoint = json.load(f)
+            self.records = checkpoint['records']
+            self.output_offset = checkpoint['output_offset']
+
+    def save(self, records: int, output_offset: int) -> None:
+        self.records = records
+        self.output_offset = output_offset
+        if self._path is None:
+            return
+        tmp_path = self._path.with_name(self._path.name + '.tmp')
+        with open(str(tmp_path), 'w') as f:
+            json.dump({'records': records, 'output_offset': output_offset}, f)
+        os.replace(str(tmp_path), str(self._path))
+
+
+class Progress:
+    """Prints number of processed records and throughput to stderr at most once per `interval` seconds"""
+
+    def __init__(self, stream: TextIO = sys.stderr, interval: float = 1.0):
+        self._stream = stream
+        self._interval = interval
+        self._started_at = monotonic()
+        self._printed_at = self._started_at
+        self.records = 0
+        self.bytes = 0
+
+    def update(self, text: str) -> None:
+        self.records += 1
+        self.bytes += len(text.encode('utf8'))
+        now = monotonic()
+        if now - self._printed_at >= self._interval:
+            self._printed_at = now
+            self._print(end='\r')
+
+    def finish(self) -> None:
+        self._print(end='\n')
+
+    def _print(self, end: str) -> None:
+        elapsed = max(monotonic() - self._started_at, 1e-9)
+        print(f'{self.records} records, {self.records / elapsed:.1f} records/s, '
+              f'{self.bytes / elapsed / 1024 ** 2:.2f} MB/s', end=end, file=self._stream, flush=True)
+
+
+class BulkReader(ABC):
+    @abstractmethod
+    def __iter__(self) -> Iterator[Record]:
+        pass
+
+
+class FilesReader(BulkReader):
+    """Every file is a record"""
+
+    def __init__(self, paths: List[Path], base_dir: Path):
+        self.paths = paths
+        self.base_dir = base_dir
+
+    @classmethod
+    def from_dir(cls, path: Path) -> 'FilesReader':
+        return cls(paths=sorted(file for file in path.rglob('*') if file.is_file()), base_dir=path)
+
+    @classmethod
+    def from_glob(cls, pattern: str) -> 'FilesReader':
+        paths = sorted(Path(path) for path in glob.glob(pattern, recursive=True) if Path(path).is_file())
+        if not paths:
+            raise ProfanityFilterError(f"No files match: '{pattern}'")
+        base_dir = Path(os.path.commonpath([str(path.parent) for path in paths]))
+        return cls(paths=paths, base_dir=base_dir)
+
+    def __iter__(self) -> Iterator[Record]:
+        for path in self.paths:
+            with open(str(path)) as f:
+                yield f.read(), path
+
+
+class JsonLinesReader(BulkReader):
+    def __init__(self, path: Path, column: str):
+        self.path = path
+        self.column = column
+
+    def __iter__(self) -> Iterator[Record]:
+        with open(str(self.path)) as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise ProfanityFilterError(f"Invalid JSON at line {line_number} of '{self.path}': {e}")
+                if not isinstance(record, dict) or self.column not in record:
+                    raise ProfanityFilterError(f"No column '{self.column}' at line {line_number} of '{self.path}'")
+                if not isinstance(record[self.column], str):
+                    raise ProfanityFilterError(f"Column '{self.column}' is not a string at line {line_number} of "
+                                               f"'{self.path}'")
+                yield record[self.column], record
+
+
+class CsvReader(BulkReader):
+    def __init__(self, path: Path, column: str):
+        self.path = path
+        self.column = column
+        with open(str(path), newline='') as f:
+            self.fieldnames = csv.DictReader(f).fieldnames or []
+        if column not in self.fieldnames:
+            raise ProfanityFilterError(f"No column '{column}' in '{path}'")
+
+    def __iter__(self) -> Iterator[Record]:
+        with open(str(self.path), newline='') as f:
+            for record in csv.DictReader(f):
+                yield record[self.column], record
+
+
+class BulkWriter(ABC):
+    """Writes results in order of records and reports position of the output to resume from"""
+
+    @abstractmethod
+    def write(self, context: Any, result: Any) -> None:
+        pass
+
+    @abstractmethod
+    def flush(self) -> int:
+        """:return: output offset after all written records"""
+
+    def close(self) -> None:
+        pass
+
+
+class FileWriter(BulkWriter):
+    """Writes lines to the output file (or stdout), truncating the output to the checkpoint on resume"""
+
+    def __init__(self, path: Optional[PathOrStr], output_offset: int = 0):
+        self._path = path
+        if path is None:
+            self._f = sys.stdout
+        else:
+            self._f = open(str(path), 'a', newline='')
+            self._f.truncate(output_offset)
+
+    def flush(self) -> int:
+        self._f.flush()
+        return self._f.tell() if self._path is not None else 0
+
+    def close(self) -> None:
+        if self._path is not None:
+            self._f.close()
+
+
+class JsonLinesWriter(FileWriter):
+    def __init__(self, path: Optional[PathOrStr], column: Optional[str], classify: bool, output_offset: int = 0):
+        super().__init__(path=path, output_offset=output_offset)
+        self._column = column
+        self._classify = classify
+
+    def write(self, context: Any, result: Any) -> None:
+        if isinstance(context, Path):
+            record = {'path': str(context), 'is_profane': result}
+        elif self._classify:
+            record = {**context, 'is_profane': result}
+        else:
+            record = {**context, self._column: result}
+        self._f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class CsvWriter(FileWriter):
+    def __init__(self, path: Optional[PathOrStr], column: str, classify: bool, fieldnames: List[str],
+                 output_offset: int = 0):
+        super().__init__(path=path, output_offset=output_offset)
+        self._column = column
+        self._classify = classify
+        if classify:
+            fieldnames = [*fieldnames, 'is_profane']
+        self._writer = csv.DictWriter(self._f, fieldnames=fieldnames)
+        if output_offset == 0:
+            self._writer.writeheader()
+
+    def write(self, context: Any, result: Any) -> None:
+        if self._classify:
+            self._writer.writerow({**context, 'is_profane': result})
+        else:
+            self._writer.writerow({**context, self._column: result})
+
+
+class DirWriter(BulkWriter):
+    """Writes censored file to the output dir under the same relative path"""
+
+    def __init__(self, path: PathOrStr, base_dir: Path):
+        self._path = Path(path)
+        self._base_dir = base_dir
+
+    def write(self, context: Any, result: Any) -> None:
+        path = self._path / context.relative_to(self._base_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(str(path), 'w') as f:
+            f.write(result)
+
+    def flush(self) -> int:
+        return 0
+
+
+def _make_reader_and_writer(source: str, output: Optional[PathOrStr], column: Optional[str], classify: bool,
+                            output_offset: int) -> Tuple[BulkReader, BulkWriter]:
+    source_path = Path(source)
+    if source_path.suffix in ('.jsonl', '.ndjson', '.csv') and source_path.is_file():
+        if column is None:
+            raise ProfanityFilterError(f"Column is required for '{source}'")
+        if source_path.suffix == '.csv':
+            reader = CsvReader(path=source_path, column=column)
+            writer = CsvWriter(path=output, column=column, classify=classify, fieldnames=reader.fieldnames,
+                               output_offset=output_offset)
+        else:
+            reader = JsonLinesReader(path=source_path, column=column)
+            writer = JsonLinesWriter(path=output, column=column, classify=classify, output_offset=output_offset)
+        return reader, writer
+
+    if source_path.is_dir():
+        reader = FilesReader.from_dir(source_path)
+    else:
+        reader = FilesReader.from_glob(source)
+    if classify:
+        writer = JsonLinesWriter(path=output, column=None, classify=True, output_offset=output_offset)
+    elif output is None:
+        raise ProfanityFilterError('Output dir is required for censoring files')
+    else:
+        writer = DirWriter(path=output, base_dir=reader.base_dir)
+    return reader, writer
+
+
+def _skip(records: Iterable[Record], count: int) -> Iterator[Record]:
+    records = iter(records)
+    for _ in range(count):
+        if next(records, None) is None:
+            break
+    return records
+
+
+def censor_bulk(profanity_filter: ProfanityFilter,
+                source: str,
+                output: Optional[PathOrStr] = None,
+                *,
+                column: Optional[str] = None,
+                classify: bool = False,
+                processes: Optional[int] = None,
+                chunk_size: int = DEFAULT_BATCH_SIZE,
+                checkpoint_path: Optional[PathOrStr] = None,
+                progress: Optional[Progress] = None) -> int:
+    """Censors (or classifies if `classify`) records of the source across the pool of worker processes
+
+    :param source: directory, glob of files (every file is a record) or JSONL/CSV file (`column` is a record)
+    :param output: output dir for censored files, otherwise JSONL/CSV file (stdout if None)
+    :param checkpoint_path: file where the offset of processed records is saved after every chunk, processing is
+        resumed from it
+    :return: number of records written
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    reader, writer = _make_reader_and_writer(source=source, output=output, column=column, classify=classify,
+                                             output_offset=checkpoint.output_offset)
+    records = _skip(reader, checkpoint.records)
+    # Records sent to the pool and not written yet
+    pending_records = deque()
+
+    def texts() -> Iterator[str]:
+        for text, context in records:
+            pending_records.append((text, context))
+            yield text
+
+    written = checkpoint.records
+    try:
+        with profanity_filter.pool(processes=processes, chunk_size=chunk_size) as pool:
+            results = pool.is_profane_iter(texts()) if classify else pool.censor_iter(texts())
+            for result in results:
+                text, context = pending_records.popleft()
+                writer.write(context, result)
+                written += 1
+                if progress is not None:
+                    progress.update(text)
+                if written % chunk_size == 0:
+                    checkpoint.save(records=written, output_offset=writer.flush())
+            checkpoint.save(records=written, output_offset=writer.flush())
+    finally:
+        writer.close()
+        if progress is not None:
+            progress.finish()
+    return written
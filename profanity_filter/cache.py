@@ -0,0 +1,409 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import (Callable, Collection, ContextManager, Dict, List, Optional, Generic, TypeVar, Tuple, Hashable,
+                    TYPE_CHECKING)
+
+from profanity_filter.substring_index import SubstringIndex
+from profanity_filter.types_ import Word
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that evicts least recently used entries above `max_entries` and entries older than `ttl` seconds"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._data: 'OrderedDict[K, Tuple[V, Optional[float]]]' = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            return default
+        if expires_at is not None and expires_at <= monotonic():
+            del self._data[key]
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        expires_at = None if self._ttl is None else monotonic() + self._ttl
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if self._max_entries is not None:
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def remove_where(self, predicate: Callable[[K, V], bool]) -> None:
+        """Removes entries for which predicate of key and value is True"""
+        for key in [key for key, (value, _) in self._data.items() if predicate(key, value)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SubstringIndexCache:
+    """Substring index of the words that evicts the oldest words above `max_entries` and words older than `ttl` seconds
+
+    Suffix automaton doesn't support deletion, so words are added to the newest of `GENERATIONS` indexes, and the
+    oldest index is dropped as a whole when the newest one is full, so eviction never rebuilds an index. A generation
+    takes new words for `ttl / GENERATIONS` seconds and is dropped `ttl` seconds after its creation, so words are
+    evicted a bit earlier than in `ttl` seconds.
+    """
+    GENERATIONS = 4
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        generations = self.GENERATIONS if max_entries is None else max(1, min(self.GENERATIONS, max_entries))
+        self._max_generations = generations
+        self._generation_max_entries = None if max_entries is None else max_entries // generations
+        # Indexes with their creation time, from the oldest to the newest
+        self._generations: List[Tuple[SubstringIndex, float]] = []
+        self.stats = CacheStats()
+
+    def __contains__(self, word: str) -> bool:
+        return any(word in index for index, _ in self._generations)
+
+    def __len__(self) -> int:
+        return sum(len(index) for index, _ in self._generations)
+
+    def add(self, word: str) -> None:
+        if word in self:
+            return
+        self._drop_expired_generations()
+        now = monotonic()
+        if not self._generations or self._is_generation_closed(*self._generations[-1], now=now):
+            self._generations.append((SubstringIndex(), now))
+            if len(self._generations) > self._max_generations:
+                self._drop_generation()
+        self._generations[-1][0].add(word)
+
+    def contains_substring(self, substring: str) -> bool:
+        self._drop_expired_generations()
+        result = any(index.contains_substring(substring) for index, _ in self._generations)
+        if result:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return result
+
+    def remove_where(self, predicate: Callable[[str], bool]) -> None:
+        """Removes words for which predicate is True, rebuilding only the indexes containing any of them"""
+        for i, (index, created_at) in enumerate(self._generations):
+            words = [word for word in index if not predicate(word)]
+            if len(words) != len(index):
+                self._generations[i] = (SubstringIndex(words), created_at)
+
+    def clear(self) -> None:
+        self._generations = []
+
+    def _is_generation_closed(self, index: SubstringIndex, created_at: float, now: float) -> bool:
+        return ((self._generation_max_entries is not None and len(index) >= self._generation_max_entries)
+                or (self._ttl is not None and now - created_at >= self._ttl / self._max_generations))
+
+    def _drop_expired_generations(self) -> None:
+        if self._ttl is None:
+            return
+        now = monotonic()
+        while self._generations and now - self._generations[0][1] >= self._ttl:
+            self._drop_generation()
+
+    def _drop_generation(self) -> None:
+        index, _ = self._generations.pop(0)
+        self.stats.evictions += len(index)
+
+
+class WordsCache(ABC):
+    """Cache of censored words and words with no profanity inside"""
+
+    @abstractmethod
+    def get_censored_word(self, word: str) -> Optional[Word]:
+        pass
+
+    @abstractmethod
+    def save_censored_word(self, word: Word) -> None:
+        pass
+
+    @abstractmethod
+    def has_no_profanity(self, words: Collection[str]) -> bool:
+        """:return: True if any of words is a part of a word with no profanity inside"""
+
+    @abstractmethod
+    def save_word_with_no_profanity_inside(self, word: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self, namespace: str = '') -> None:
+        """Drops cached words
+
+        :param namespace: identifier of settings affecting censoring, caches with the same namespace can share words
+        """
+
+    @abstractmethod
+    def drop_words(self, censored_words: Callable[[Word], bool],
+                   words_with_no_profanity_inside: Callable[[str], bool]) -> None:
+        """Drops cached words for which predicates are True, keeping the rest"""
+
+    @contextmanager
+    def batch(self, words: Collection[str]) -> ContextManager[None]:
+        """Hints that words are going to be looked up soon, so the cache can fetch them at once"""
+        yield
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        """Statistics of the in-process parts of the cache"""
+        return {}
+
+
+class LocalWordsCache(WordsCache):
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self._censored_words: LRUCache[str, Word] = LRUCache(max_entries=max_entries, ttl=ttl)
+        # Words with no profanity inside that are generated after censoring
+        # (include words that are not in the dictionary)
+        self._words_with_no_profanity_inside = SubstringIndexCache(max_entries=max_entries, ttl=ttl)
+
+    def get_censored_word(self, word: str) -> Optional[Word]:
+        return self._censored_words.get(word)
+
+    def save_censored_word(self, word: Word) -> None:
+        self._censored_words.set(word.uncensored, word)
+
+    def has_no_profanity(self, words: Collection[str]) -> bool:
+        return any(self._words_with_no_profanity_inside.contains_substring(word) for word in words)
+
+    def save_word_with_no_profanity_inside(self, word: str) -> None:
+        self._words_with_no_profanity_inside.add(word)
+
+    def clear(self, namespace: str = '') -> None:
+        self._censored_words.clear()
+        self._words_with_no_profanity_inside.clear()
+
+    def drop_words(self, censored_words: Callable[[Word], bool],
+                   words_with_no_profanity_inside: Callable[[str], bool]) -> None:
+        self._censored_words.remove_where(lambda _, word: censored_words(word))
+        self._words_with_no_profanity_inside.remove_where(words_with_no_profanity_inside)
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        return {
+            'censored_words': self._censored_words.stats,
+            'words_with_no_profanity_inside': self._words_with_no_profanity_inside.stats,
+        }
+
+
+class RedisWordsCache(WordsCache):
+    """Cache shared between processes through Redis
+
+    Lookups of words of a batch are made in one pipeline, and writes are sent in one pipeline at the end of the
+    batch. Words with no profanity inside are kept in the local substring index, which is synchronized with the
+    append-only Redis list by fetching only the new entries.
+
+    All keys are prefixed with the namespace, so processes with different settings can share one Redis database.
+    Clearing the cache switches to another namespace instead of deleting keys, keys of unused namespaces expire after
+    `ttl` seconds.
+    """
+    KEY_PREFIX = 'profanity_filter'
+
+    def __init__(self, redis: 'Redis', namespace: str = '', sync_interval: float = 1.0, ttl: Optional[int] = 86400,
+                 max_local_entries: Optional[int] = None):
+        self._redis = redis
+        self._namespace = namespace
+        self._sync_interval = sync_interval
+        self._ttl = ttl
+        self._max_local_entries = max_local_entries
+        self._synced_at: Optional[float] = None
+        self._words_with_no_profanity_inside = SubstringIndexCache(max_entries=max_local_entries)
+        self._words_with_no_profanity_inside_synced = 0
+        # Lookups and writes of the current batch
+        self._batch_depth = 0
+        self._batch_censored_words: Dict[str, Optional[Word]] = {}
+        self._pending_censored_words: List[Word] = []
+        self._pending_words_with_no_profanity_inside: List[str] = []
+
+    def get_censored_word(self, word: str) -> Optional[Word]:
+        try:
+            return self._batch_censored_words[word]
+        except KeyError:
+            return self._parse_censored_word(self._redis.hgetall(self._get_censored_word_key(word)))
+
+    def save_censored_word(self, word: Word) -> None:
+        if self._batch_depth:
+            self._batch_censored_words[word.uncensored] = word
+            self._pending_censored_words.append(word)
+        else:
+            self._flush_words(censored_words=[word], words_with_no_profanity_inside=[])
+
+    def has_no_profanity(self, words: Collection[str]) -> bool:
+        if not self._batch_depth and (self._synced_at is None or
+                                      monotonic() - self._synced_at >= self._sync_interval):
+            self._sync(self._redis.pipeline())
+        return any(self._words_with_no_profanity_inside.contains_substring(word) for word in words)
+
+    def save_word_with_no_profanity_inside(self, word: str) -> None:
+        if word in self._words_with_no_profanity_inside:
+            return
+        self._words_with_no_profanity_inside.add(word)
+        if self._batch_depth:
+            self._pending_words_with_no_profanity_inside.append(word)
+        else:
+            self._flush_words(censored_words=[], words_with_no_profanity_inside=[word])
+
+    def clear(self, namespace: str = '') -> None:
+        self._namespace = namespace
+        self._synced_at = None
+        self._reset_local_copy()
+
+    def drop_words(self, censored_words: Callable[[Word], bool],
+                   words_with_no_profanity_inside: Callable[[str], bool]) -> None:
+        """Drops cached words of the namespace for which predicates are True, keeping the rest
+
+        Other processes fetch only new entries of the append-only list of words with no profanity inside, so the list
+        is deleted as a whole if any of its words is dropped. They notice that the list got shorter and fetch it again.
+        """
+        self._flush()
+        keys = list(self._redis.scan_iter(match=self._get_censored_word_key('*')))
+        pipeline = self._redis.pipeline()
+        for key in keys:
+            pipeline.hgetall(key)
+        dropped_keys = [key for key, response in zip(keys, pipeline.execute())
+                        if response and censored_words(self._parse_censored_word(response))]
+        key = self._get_words_with_no_profanity_inside_key()
+        pipeline = self._redis.pipeline()
+        if dropped_keys:
+            pipeline.delete(*dropped_keys)
+        if any(words_with_no_profanity_inside(word.decode('utf8')) for word in self._redis.lrange(key, 0, -1)):
+            pipeline.delete(key)
+            self._synced_at = None
+            self._reset_local_copy()
+        pipeline.execute()
+
+    @contextmanager
+    def batch(self, words: Collection[str]) -> ContextManager[None]:
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+        words = list(words)
+        pipeline = self._redis.pipeline()
+        for word in words:
+            pipeline.hgetall(self._get_censored_word_key(word))
+        responses = self._sync(pipeline)
+        self._batch_censored_words = {word: self._parse_censored_word(response)
+                                      for word, response in zip(words, responses)}
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            self._flush()
+
+    def _flush(self) -> None:
+        self._flush_words(censored_words=self._pending_censored_words,
+                          words_with_no_profanity_inside=self._pending_words_with_no_profanity_inside)
+        self._batch_censored_words = {}
+        self._pending_censored_words = []
+        self._pending_words_with_no_profanity_inside = []
+
+    def _flush_words(self, censored_words: List[Word], words_with_no_profanity_inside: List[str]) -> None:
+        if not censored_words and not words_with_no_profanity_inside:
+            return
+        pipeline = self._redis.pipeline(transaction=False)
+        for word in censored_words:
+            key = self._get_censored_word_key(word.uncensored)
+            pipeline.hmset(key, self._dump_censored_word(word))
+            if self._ttl is not None:
+                pipeline.expire(key, self._ttl)
+        if words_with_no_profanity_inside:
+            key = self._get_words_with_no_profanity_inside_key()
+            pipeline.rpush(key, *words_with_no_profanity_inside)
+            if self._ttl is not None:
+                pipeline.expire(key, self._ttl)
+        pipeline.execute()
+
+    def _get_censored_word_key(self, word: str) -> str:
+        return f'{self.KEY_PREFIX}:{self._namespace}:censored:{word}'
+
+    def _get_words_with_no_profanity_inside_key(self) -> str:
+        return f'{self.KEY_PREFIX}:{self._namespace}:words_with_no_profanity_inside'
+
+    def _reset_local_copy(self) -> None:
+        self._words_with_no_profanity_inside.clear()
+        self._words_with_no_profanity_inside_synced = 0
+
+    def _sync(self, pipeline) -> list:
+        """Executes pipeline together with fetching new words with no profanity inside
+
+        :return: responses to the commands queued to the pipeline before the call
+        """
+        key = self._get_words_with_no_profanity_inside_key()
+        pipeline.llen(key)
+        pipeline.lrange(key, self._words_with_no_profanity_inside_synced, -1)
+        *responses, length, new_words = pipeline.execute()
+        if length < self._words_with_no_profanity_inside_synced:
+            # The list has expired
+            self._reset_local_copy()
+            new_words = self._redis.lrange(key, 0, -1)
+        for word in new_words:
+            self._words_with_no_profanity_inside.add(word.decode('utf8'))
+        self._words_with_no_profanity_inside_synced += len(new_words)
+        self._synced_at = monotonic()
+        return responses
+
+    @property
+    def stats(self) -> Dict[str, CacheStats]:
+        return {
+            'words_with_no_profanity_inside': self._words_with_no_profanity_inside.stats,
+        }
+
+    @staticmethod
+    def _parse_censored_word(d: Dict[bytes, bytes]) -> Optional[Word]:
+        if not d:
+            return None
+        uncensored, censored, original_profane_word = (d[b'uncensored'].decode('utf8'), d[b'censored'].decode('utf8'),
+                                                       d[b'original_profane_word'].decode('utf8'))
+        if not original_profane_word:
+            original_profane_word = None
+        return Word(uncensored=uncensored, censored=censored, original_profane_word=original_profane_word)
+
+    @staticmethod
+    def _dump_censored_word(word: Word) -> Dict[str, str]:
+        d = dict(word)
+        if not word.original_profane_word:
+            d['original_profane_word'] = ''
+        return d
@@ -0,0 +1,88 @@
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from profanity_filter.aho_corasick import AhoCorasickAutomaton
+from profanity_filter.bigram_index import BigramIndex
+from profanity_filter.deletion_index import DeletionIndex
+from profanity_filter.types_ import Language, ProfaneWordDictionaries, PathOrStr
+
+
+class CompiledDictionaries:
+    """Profane word dictionaries merged for the settings together with search structures built from them
+
+    Can be saved to the versioned binary file and loaded back without rebuilding search structures. File layout:
+    magic, format version, length of key, key (identifies settings and sources of dictionaries), pickled payload.
+    """
+    MAGIC = b'PFDICT'
+    VERSION = 3
+    _HEADER = struct.Struct('<6sII')
+
+    def __init__(self,
+                 key: str,
+                 dictionaries: ProfaneWordDictionaries,
+                 alphabet: Set[str],
+                 tries: Dict[Language, Any],
+                 deletion_indexes: Dict[Language, DeletionIndex],
+                 bigram_indexes: Dict[Language, BigramIndex],
+                 exact_match_automata: Dict[Language, AhoCorasickAutomaton]):
+        self.key = key
+        self.dictionaries = dictionaries
+        # For Levenshtein automata
+        self.alphabet = alphabet
+        # Tries of pyffs (deep analysis)
+        self.tries = tries
+        # Deletion indexes (deep analysis with SymSpell fuzzy backend)
+        self.deletion_indexes = deletion_indexes
+        # For skipping parts of words that can't be fuzzy matched (deep analysis)
+        self.bigram_indexes = bigram_indexes
+        # For finding regions of text that may contain profane words
+        self.exact_match_automata = exact_match_automata
+
+    def dump(self, path: PathOrStr) -> None:
+        """Writes the file atomically, so that other processes never read a partially written file"""
+        path = Path(path)
+        key = self.key.encode('utf8')
+        payload = pickle.dumps((self.dictionaries, self.alphabet, self.tries, self.deletion_indexes,
+                                self.bigram_indexes, self.exact_match_automata), protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with open(str(tmp_path), 'wb') as f:
+                f.write(self._HEADER.pack(self.MAGIC, self.VERSION, len(key)))
+                f.write(key)
+                f.write(payload)
+            os.replace(str(tmp_path), str(path))
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @classmethod
+    def load(cls, path: PathOrStr, key: Optional[str] = None) -> Optional['CompiledDictionaries']:
+        """:return: compiled dictionaries or None if file is missing, unreadable, truncated, corrupted, has another
+        version or doesn't match key"""
+        try:
+            with open(str(path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < cls._HEADER.size:
+            return None
+        magic, version, key_length = cls._HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            return None
+        offset = cls._HEADER.size
+        try:
+            file_key = data[offset:offset + key_length].decode('utf8')
+            if key is not None and file_key != key:
+                return None
+            (dictionaries, alphabet, tries, deletion_indexes, bigram_indexes,
+             exact_match_automata) = pickle.loads(data[offset + key_length:])
+        # Pickles of renamed or refactored classes fail with lookup errors
+        except (pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError, IndexError,
+                KeyError):
+            return None
+        return cls(key=file_key, dictionaries=dictionaries, alphabet=alphabet, tries=tries,
+                   deletion_indexes=deletion_indexes, bigram_indexes=bigram_indexes,
+                   exact_match_automata=exact_match_automata)
@@ -4,20 +4,40 @@ from pathlib import Path
 from pydantic import BaseModel
 from ruamel.yaml import YAML
 
-from profanity_filter.types_ import AnalysisType, Language, PathOrStr
+from profanity_filter.types_ import AnalysisType, FuzzyBackend, Language, PathOrStr
 
 
 _yaml = YAML(typ='safe')
 
 
+class WebConfig(BaseModel):
+    # Number of worker processes censoring requests (None - number of CPUs)
+    workers: Optional[int] = None
+    # Max number of requests waiting for a free worker, requests above it are rejected with 503
+    max_queue_size: int = 64
+    # Max seconds to wait for the result, after that request is rejected with 503 (None - wait forever)
+    timeout: Optional[float] = 10.0
+    # Max number of texts of concurrent requests censored at once
+    batch_max_size: int = 256
+    # Max milliseconds to wait for other requests to fill a batch when all workers are busy
+    batch_max_wait_ms: float = 5.0
+
+
 # noinspection PyTypeChecker
 class Config(BaseModel):
     analyses: List[AnalysisType] = list(AnalysisType)
+    cache_max_entries: Optional[int] = 100000
     cache_redis_connection_url: Optional[str] = None
+    cache_redis_ttl: Optional[int] = 86400
+    cache_ttl: Optional[float] = None
     censor_char: str = '*'
     censor_whole_words: bool = True
+    compiled_dictionaries_path: Optional[str] = None
+    exact_match_prefilter: bool = False
+    fuzzy_backend: FuzzyBackend = FuzzyBackend.TRIE
     languages: List[Language] = ['en']
     max_relative_distance: float = 0.34
+    web: WebConfig = WebConfig()
 
     @classmethod
     def from_yaml(cls, path: PathOrStr) -> 'Config':
@@ -26,6 +46,8 @@ class Config(BaseModel):
             config_dict = {}
         if 'analyses' in config_dict:
             config_dict['analyses'] = [AnalysisType(analysis) for analysis in config_dict['analyses']]
+        if 'fuzzy_backend' in config_dict:
+            config_dict['fuzzy_backend'] = FuzzyBackend(config_dict['fuzzy_backend'])
         return cls(**config_dict)
 
     def to_yaml(self, path: PathOrStr, exist_ok: bool = True) -> None:
@@ -35,6 +57,7 @@ class Config(BaseModel):
             raise FileExistsError(f"File exists: '{path}'")
         config_dict = self.dict(exclude=set('analyses'))
         config_dict['analyses'] = [analysis.value for analysis in self.analyses]
+        config_dict['fuzzy_backend'] = self.fuzzy_backend.value
         with open(str(path), 'w') as f:
             _yaml.dump(config_dict, f)
 
@@ -1,7 +1,14 @@
 from sys import exit
 import argparse
+import sys
 
-from profanity_filter.profanity_filter import ProfanityFilter
+from profanity_filter.bulk import censor_bulk, Progress
+from profanity_filter.profanity_filter import ProfanityFilter, DEFAULT_BATCH_SIZE
+from profanity_filter.types_ import ProfanityFilterError
+
+
+# Size of chunks read from the input in streaming mode
+STREAM_READ_SIZE = 8 * 1024
 
 
 def main():
@@ -9,10 +16,26 @@ def main():
     group = parser.add_mutually_exclusive_group()
     group.add_argument('-t', '--text', dest='text', help='Test the given text for profanity')
     group.add_argument('-f', '--file', dest='path', help='Test the given file for profanity')
+    group.add_argument('--bulk', dest='bulk_source',
+                       help='Censor records of the directory, glob of files or JSONL/CSV file (see --column) across '
+                            'worker processes')
     parser.add_argument('-l', '--languages', dest='languages', default='en',
                         help='Test for profanity using specified languages (comma separated)')
     parser.add_argument('-o', '--output', dest='output_file', help='Write the censored output to a file')
     parser.add_argument('--show', action='store_true', help='Print the censored text')
+    parser.add_argument('--stream', action='store_true',
+                        help='Censor the file (or stdin) chunk by chunk in constant memory and write the censored text '
+                             'to the output file (or stdout)')
+    bulk_group = parser.add_argument_group('bulk mode')
+    bulk_group.add_argument('--column', help='Field of JSONL or column of CSV records to censor')
+    bulk_group.add_argument('--classify', action='store_true', help='Add is_profane flags instead of censoring')
+    bulk_group.add_argument('--processes', type=int, help='Number of worker processes (default: number of CPUs)')
+    bulk_group.add_argument('--chunk-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Number of records sent to a worker at once')
+    bulk_group.add_argument('--checkpoint', dest='checkpoint_path',
+                            help='Save the offset of processed records to the file and resume from it')
+    parser.add_argument('--compiled-dictionaries', dest='compiled_dictionaries_path',
+                        help='Load compiled profane word dictionaries from the file (compile them there if missing)')
 
     args = parser.parse_args()
 
@@ -20,6 +43,35 @@ def main():
         parser.print_help()
         exit()
 
+    if args.stream and args.text:
+        parser.print_help()
+        exit()
+
+    pf = ProfanityFilter(languages=args.languages.split(','),
+                         compiled_dictionaries_path=args.compiled_dictionaries_path)
+
+    if args.bulk_source:
+        try:
+            censor_bulk(pf, args.bulk_source, args.output_file, column=args.column, classify=args.classify,
+                        processes=args.processes, chunk_size=args.chunk_size, checkpoint_path=args.checkpoint_path,
+                        progress=Progress())
+        except ProfanityFilterError as e:
+            parser.error(str(e))
+        return
+
+    if args.stream:
+        input_file = open(args.path) if args.path else sys.stdin
+        output_file = open(args.output_file, 'w') if args.output_file else sys.stdout
+        try:
+            for censored_chunk in pf.censor_stream(iter(lambda: input_file.read(STREAM_READ_SIZE), '')):
+                output_file.write(censored_chunk)
+        finally:
+            if args.path:
+                input_file.close()
+            if args.output_file:
+                output_file.close()
+        return
+
     if args.text:
         text = args.text
     elif args.path:
@@ -28,7 +80,6 @@ def main():
     else:
         text = ''
 
-    pf = ProfanityFilter(languages=args.languages.split(','))
     censored_text = pf.censor(text)
 
     if args.output_file:
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+
+class DeletionIndex:
+    """Finds words within the Levenshtein distance by symmetric deletions (SymSpell algorithm)
+
+    Every word is indexed under all variants made by deleting up to `max_distance` chars. Words within distance `k`
+    from the query share a variant with one of the query's variants made by up to `k` deletions, so the lookup takes
+    a few hash lookups and the candidates are verified by computing the distance.
+    """
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = 3):
+        self.max_distance = max_distance
+        self._words: Set[str] = set()
+        self._deletions: Dict[str, Set[str]] = defaultdict(set)
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str) -> None:
+        if word in self._words:
+            return
+        self._words.add(word)
+        for variant in self._get_deletions(word, max_distance=self.max_distance):
+            self._deletions[variant].add(word)
+
+    def remove(self, word: str) -> None:
+        if word not in self._words:
+            return
+        self._words.remove(word)
+        for variant in self._get_deletions(word, max_distance=self.max_distance):
+            words = self._deletions[variant]
+            words.discard(word)
+            if not words:
+                del self._deletions[variant]
+
+    def lookup(self, word: str, max_distance: int) -> List[str]:
+        """:return: words within `max_distance` (not greater than the one of the index), closest first"""
+        max_distance = min(max_distance, self.max_distance)
+        candidates = set()
+        for variant in self._get_deletions(word, max_distance=max_distance):
+            candidates |= self._deletions.get(variant, set())
+        distances = {}
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) <= max_distance:
+                distance = self._get_distance(word, candidate, max_distance=max_distance)
+                if distance <= max_distance:
+                    distances[candidate] = distance
+        return sorted(distances, key=lambda candidate: (distances[candidate], candidate))
+
+    @staticmethod
+    def _get_deletions(word: str, max_distance: int) -> Set[str]:
+        result = {word}
+        variants = {word}
+        for _ in range(max_distance):
+            variants = {variant[:i] + variant[i + 1:] for variant in variants for i in range(len(variant))}
+            result |= variants
+        return result
+
+    @staticmethod
+    def _get_distance(s1: str, s2: str, max_distance: int) -> int:
+        """:return: Levenshtein distance or `max_distance + 1` if it's greater than `max_distance`"""
+        previous = list(range(len(s2) + 1))
+        for i, char1 in enumerate(s1, start=1):
+            current = [i]
+            for j, char2 in enumerate(s2, start=1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char1 != char2)))
+            if min(current) > max_distance:
+                return max_distance + 1
+            previous = current
+        return min(previous[-1], max_distance + 1)
@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Union, Dict, Any
+
+from profanity_filter.profanity_filter import ProfanityFilter, DEFAULT_BATCH_SIZE
+
+
+# Profanity filter of the worker process
+_profanity_filter: Optional[ProfanityFilter] = None
+
+
+def _init_worker(profanity_filter: Union[ProfanityFilter, Dict[str, Any]]) -> None:
+    global _profanity_filter
+    if isinstance(profanity_filter, ProfanityFilter):
+        _profanity_filter = profanity_filter
+    else:
+        settings = dict(profanity_filter)
+        removed_profane_words = settings.pop('removed_profane_words')
+        _profanity_filter = ProfanityFilter(**settings)
+        for language, words in removed_profane_words.items():
+            _profanity_filter.remove_words(language, words)
+
+
+def _censor_many(texts: List[str]) -> List[str]:
+    return _profanity_filter.censor_many(texts)
+
+
+def _is_profane_many(texts: List[str]) -> List[bool]:
+    return _profanity_filter.is_profane_many(texts)
+
+
+def _chunks(texts: Iterable[str], chunk_size: int) -> Iterable[List[str]]:
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ProfanityFilterPool:
+    """Censors batches of texts in worker processes
+
+    Where `fork` start method is available, workers inherit the warmed up profanity filter with loaded models,
+    dictionaries and automata, sharing their memory pages with the parent process. Otherwise, every worker creates
+    profanity filter with the same settings.
+    """
+
+    def __init__(self, profanity_filter: ProfanityFilter, processes: Optional[int] = None,
+                 chunk_size: int = DEFAULT_BATCH_SIZE):
+        self._chunk_size = chunk_size
+        self._max_pending_chunks = 2 * (processes or os.cpu_count() or 1)
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            # Warm up before forking so that workers don't repeat the work
+            profanity_filter.warm_up()
+            worker_profanity_filter = profanity_filter
+        else:
+            context = multiprocessing.get_context()
+            worker_profanity_filter = self._get_settings(profanity_filter)
+        self._pool = context.Pool(processes=processes, initializer=_init_worker, initargs=(worker_profanity_filter, ))
+
+    def __enter__(self) -> 'ProfanityFilterPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def censor_many(self, texts: Iterable[str], chunk_size: Optional[int] = None) -> List[str]:
+        """Returns texts with any profane words censored in the same order, spreading chunks of texts across workers"""
+        return self._map(_censor_many, texts=texts, chunk_size=chunk_size)
+
+    def censor_iter(self, texts: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[str]:
+        """Lazy version of `censor_many`: texts are read and results are yielded as chunks are processed"""
+        return self._imap(_censor_many, texts=texts, chunk_size=chunk_size)
+
+    def is_profane_many(self, texts: Iterable[str], chunk_size: Optional[int] = None) -> List[bool]:
+        """Returns list of flags (True if text contains any profane words) in the same order as texts"""
+        return self._map(_is_profane_many, texts=texts, chunk_size=chunk_size)
+
+    def is_profane_iter(self, texts: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[bool]:
+        """Lazy version of `is_profane_many`"""
+        return self._imap(_is_profane_many, texts=texts, chunk_size=chunk_size)
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def _map(self, f, texts: Iterable[str], chunk_size: Optional[int]) -> list:
+        return list(self._imap(f, texts=texts, chunk_size=chunk_size))
+
+    def _imap(self, f, texts: Iterable[str], chunk_size: Optional[int]) -> Iterator:
+        """Yields results in order keeping a bounded number of chunks in flight, so texts are read lazily"""
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+        pending = deque()
+        for chunk in _chunks(texts, chunk_size=chunk_size):
+            pending.append(self._pool.apply_async(f, (chunk, )))
+            if len(pending) > self._max_pending_chunks:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+    @staticmethod
+    def _get_settings(profanity_filter: ProfanityFilter) -> Dict[str, Any]:
+        return dict(
+            languages=list(profanity_filter.languages),
+            analyses=profanity_filter.analyses,
+            cache_max_entries=profanity_filter.cache_max_entries,
+            cache_redis_connection_url=profanity_filter.cache_redis_connection_url,
+            cache_redis_ttl=profanity_filter.cache_redis_ttl,
+            cache_ttl=profanity_filter.cache_ttl,
+            censor_char=profanity_filter.censor_char,
+            censor_whole_words=profanity_filter.censor_whole_words,
+            compiled_dictionaries_path=profanity_filter.compiled_dictionaries_path,
+            custom_profane_word_dictionaries={language: list(words) for language, words
+                                              in profanity_filter.custom_profane_word_dictionaries.items()},
+            exact_match_prefilter=profanity_filter.exact_match_prefilter,
+            extra_profane_word_dictionaries={language: list(words) for language, words
+                                             in profanity_filter.extra_profane_word_dictionaries.items()},
+            fuzzy_backend=profanity_filter.fuzzy_backend,
+            max_relative_distance=profanity_filter.max_relative_distance,
+            removed_profane_words={language: list(words) for language, words
+                                   in profanity_filter.removed_profane_words.items()},
+        )
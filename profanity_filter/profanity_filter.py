@@ -1,28 +1,51 @@
+import hashlib
+import importlib
+import inspect
+import pickle
 import re
+import unicodedata
 from collections import defaultdict
+from collections.abc import Set
 from contextlib import suppress, contextmanager
-from copy import deepcopy
+from copy import copy, deepcopy
 from itertools import chain
 from math import floor
 from pathlib import Path
-from typing import Dict, Union, List, Tuple, Set, Collection, ContextManager, Optional
+from typing import (Any, Callable, Dict, Union, List, Tuple, Collection, ContextManager, Optional, Iterable, Iterator,
+                    NamedTuple, TypeVar, TYPE_CHECKING)
 
 import poetry_version
-import spacy
-import spacy.attrs
-import spacy.language
-import spacy.tokens
 from cached_property import cached_property
 from more_itertools import substrings_indexes
 from ordered_set import OrderedSet
-from redis import Redis
 
 from profanity_filter import spacy_utlis
+from profanity_filter.aho_corasick import AhoCorasickAutomaton
+from profanity_filter.bigram_index import BigramIndex
+from profanity_filter.cache import WordsCache, LocalWordsCache, RedisWordsCache, LRUCache, CacheStats
+from profanity_filter.compiled_dictionaries import CompiledDictionaries
 from profanity_filter.config import Config, DEFAULT_CONFIG
+from profanity_filter.deletion_index import DeletionIndex
 from profanity_filter.spacy_component import SpacyProfanityFilterComponent
-from profanity_filter.types_ import (Words, Language, ProfaneWordDictionaries, ProfaneWordDictionariesAcceptable,
+from profanity_filter.spacy_utlis import LightweightToken
+from profanity_filter.types_ import (Language, ProfaneWordDictionaries, ProfaneWordDictionariesAcceptable,
                                      Languages, LanguagesAcceptable, Nlps, Morphs, Spells, Substrings,
-                                     TextSplittedByLanguage, ProfanityFilterError, Word, AnalysisType, AnalysesTypes)
+                                     TextSplittedByLanguage, ProfanityFilterError, Word, AnalysisType, AnalysesTypes,
+                                     Token, PathOrStr, CensoredSpan, CensoredText, FuzzyBackend)
+
+if TYPE_CHECKING:
+    import spacy.language
+    import spacy.tokens
+    from redis import Redis
+
+
+class _ReloadedDictionaries(NamedTuple):
+    """Dictionaries rebuilt by the watcher thread, to be swapped in by the censoring thread"""
+    old: CompiledDictionaries
+    old_key: str
+    new: CompiledDictionaries
+    added: set
+    removed: set
 
 
 class DummyHunSpell:
@@ -62,37 +85,85 @@ Trie = None
 MorphAnalyzer = DummyMorphAnalyzer
 
 
-_available_analyses_list = []
+# Analyses are imported on first use, so that importing the library doesn't import their dependencies
+_imported_analyses: Dict[AnalysisType, bool] = {}
+
+
+def _import_analysis(analysis: AnalysisType) -> bool:
+    """Imports dependencies of analysis into the module namespace (as star import does)
+
+    :return: True if analysis is available
+    """
+    with suppress(KeyError):
+        return _imported_analyses[analysis]
+    try:
+        module = importlib.import_module(f'profanity_filter.analysis.{analysis.value}')
+    except ImportError:
+        _imported_analyses[analysis] = False
+    else:
+        globals().update((name, value) for name, value in vars(module).items() if not name.startswith('_'))
+        _imported_analyses[analysis] = True
+    return _imported_analyses[analysis]
+
 
-with suppress(ImportError):
-    from profanity_filter.analysis.deep import *
-    _available_analyses_list.append(AnalysisType.DEEP)
+class _AvailableAnalyses(Set):
+    """Set of analyses which dependencies are installed, they are imported on first access"""
 
-with suppress(ImportError):
-    from profanity_filter.analysis.morphological import *
-    _available_analyses_list.append(AnalysisType.MORPHOLOGICAL)
+    def __contains__(self, analysis: AnalysisType) -> bool:
+        return isinstance(analysis, AnalysisType) and _import_analysis(analysis)
 
-with suppress(ImportError):
-    from profanity_filter.analysis.multilingual import *
-    _available_analyses_list.append(AnalysisType.MULTILINGUAL)
+    def __iter__(self) -> Iterator[AnalysisType]:
+        return (analysis for analysis in AnalysisType if _import_analysis(analysis))
 
-AVAILABLE_ANALYSES: AnalysesTypes = frozenset(_available_analyses_list)
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(frozenset(self))
+
+
+AVAILABLE_ANALYSES: AnalysesTypes = _AvailableAnalyses()
 
 
 APP_NAME = 'profanity-filter'
+DEFAULT_BATCH_SIZE = 1000
+# Max length of whitespace delimited chunks of text parsed one by one when only detection is needed
+DETECTION_CHUNK_SIZE = 1000
+# Min length of text censored at once when censoring a stream
+STREAM_BUFFER_SIZE = 64 * 1024
+# Max length of texts whose detected languages are cached
+DETECTION_CACHE_MAX_TEXT_LENGTH = 256
 __version__ = poetry_version.extract(source_file=__file__)
 
+T = TypeVar('T')
+
+# Max distance of Levenshtein automata already generated to files by this process
+_generated_automata_max_distance = -1
+
+
+def _generate_automata_files(max_distance: int) -> None:
+    global _generated_automata_max_distance
+    for distance in range(_generated_automata_max_distance + 1, max_distance + 1):
+        generate_automaton_to_file(distance)
+    _generated_automata_max_distance = max(_generated_automata_max_distance, max_distance)
+
 
 class ProfanityFilter:
     def __init__(self,
                  languages: LanguagesAcceptable = tuple(DEFAULT_CONFIG.languages),
                  *,
                  analyses: AnalysesTypes = frozenset(DEFAULT_CONFIG.analyses),
+                 cache_max_entries: Optional[int] = DEFAULT_CONFIG.cache_max_entries,
                  cache_redis_connection_url: Optional[str] = None,
+                 cache_redis_ttl: Optional[int] = DEFAULT_CONFIG.cache_redis_ttl,
+                 cache_ttl: Optional[float] = DEFAULT_CONFIG.cache_ttl,
                  censor_char: str = DEFAULT_CONFIG.censor_char,
                  censor_whole_words: bool = DEFAULT_CONFIG.censor_whole_words,
+                 compiled_dictionaries_path: Optional[PathOrStr] = DEFAULT_CONFIG.compiled_dictionaries_path,
                  custom_profane_word_dictionaries: ProfaneWordDictionariesAcceptable = None,
+                 exact_match_prefilter: bool = DEFAULT_CONFIG.exact_match_prefilter,
                  extra_profane_word_dictionaries: ProfaneWordDictionariesAcceptable = None,
+                 fuzzy_backend: FuzzyBackend = DEFAULT_CONFIG.fuzzy_backend,
                  max_relative_distance: float = DEFAULT_CONFIG.max_relative_distance,
                  morphs: Optional[Morphs] = None,
                  nlps: Optional[Nlps] = None,
@@ -107,29 +178,57 @@ class ProfanityFilter:
         # Set dummy values to satisfy the linter (they will be overwritten in `config`)
         self._analyses: AnalysesTypes = frozenset()
         self._cache_clearing_disabled: bool = False
-        self._cache_redis: Optional[Redis] = None
+        # Artifacts to rebuild when cache clearing is enabled again, see `_invalidate`
+        self._pending_invalidations: set = set()
+        self._cache_max_entries: Optional[int] = None
+        self._cache_redis: Optional['Redis'] = None
         self._cache_redis_connection_url: Optional[str] = None
+        self._cache_redis_ttl: Optional[int] = None
+        self._cache_ttl: Optional[float] = None
         self._censor_char: str = ''
         self._censor_whole_words: bool = False
+        self._compiled_dictionaries_path: Optional[Path] = None
         self._custom_profane_word_dictionaries: ProfaneWordDictionaries = {}
+        self._exact_match_prefilter: bool = False
         self._extra_profane_word_dictionaries: ProfaneWordDictionaries = {}
+        self._fuzzy_backend: FuzzyBackend = FuzzyBackend.TRIE
         self._languages: Languages = OrderedSet()
         self._max_relative_distance: float = 0.0
         self._morphs: Morphs = {}
         self._nlps: Nlps = {}
         self._profane_word_dictionary_files: Dict[Language, Path] = {}
+        self._removed_profane_words: ProfaneWordDictionaries = defaultdict(lambda: OrderedSet())
         self._spells: Spells = {}
 
-        # For Levenshtein automata
-        self._alphabet = set()
-        self._trie = {}
+        # Models are loaded per language on first use, unless passed by user
+        self._load_models: Dict[str, bool] = {'morphs': False, 'nlps': False, 'spells': False}
+        self._model_loading_failed: Dict[str, set] = {'morphs': set(), 'nlps': set(), 'spells': set()}
+
+        # Merged dictionaries with search structures, reused while settings and source files are unchanged.
+        # Search structures are always read through this reference, so replacing it swaps all of them at once.
+        self._compiled_dictionaries: Optional[CompiledDictionaries] = None
+        # Dictionaries reloaded in the background, caches are only changed by the censoring thread when swapping them in
+        self._reloaded_dictionaries: Optional[_ReloadedDictionaries] = None
+        # Reloaded dictionaries are not swapped in during batches, so all words of a batch are censored with the same
+        self._words_cache_batch_depth: int = 0
+
+        # Cache of censored words and words with no profanity inside
+        self._words_cache: WordsCache = LocalWordsCache()
+
+        # Cache of tokens made from words and their parts without running Spacy pipeline
+        self._tokens: LRUCache[Tuple[Language, str], LightweightToken] = LRUCache()
 
-        # Cache of censored words
-        self._censored_words: Words = {}
+        # Cache of profane words matching words by deep analysis, by (language, word, tolerance)
+        self._fuzzy_matches: LRUCache[Tuple[Language, str, int], List[str]] = LRUCache()
 
-        # Cache of words with no profanity inside that is generated after censoring
-        # (include words that are not in the dictionary)
-        self._words_with_no_profanity_inside: Set[str] = set()
+        # Caches of results of spell checkers (spell, stem) and morphological analyzers (normal form of first parse),
+        # by (language, word)
+        self._spell_results: LRUCache[Tuple[Language, str], bool] = LRUCache()
+        self._stem_results: LRUCache[Tuple[Language, str], Tuple[str, ...]] = LRUCache()
+        self._parse_results: LRUCache[Tuple[Language, str], str] = LRUCache()
+
+        # Cache of languages detected in short texts (multilingual analysis)
+        self._detected_languages: LRUCache[str, Tuple[Language, ...]] = LRUCache()
 
         # What to be censored - should not be modified by user
         self._censor_dictionaries: ProfaneWordDictionaries = {}
@@ -138,11 +237,17 @@ class ProfanityFilter:
             self.config(
                 languages=languages,
                 analyses=analyses,
+                cache_max_entries=cache_max_entries,
                 cache_redis_connection_url=cache_redis_connection_url,
+                cache_redis_ttl=cache_redis_ttl,
+                cache_ttl=cache_ttl,
                 censor_char=censor_char,
                 censor_whole_words=censor_whole_words,
+                compiled_dictionaries_path=compiled_dictionaries_path,
                 custom_profane_word_dictionaries=custom_profane_word_dictionaries,
+                exact_match_prefilter=exact_match_prefilter,
                 extra_profane_word_dictionaries=extra_profane_word_dictionaries,
+                fuzzy_backend=fuzzy_backend,
                 max_relative_distance=max_relative_distance,
                 morphs=morphs,
                 nlps=nlps,
@@ -155,39 +260,59 @@ class ProfanityFilter:
                languages: LanguagesAcceptable = tuple(DEFAULT_CONFIG.languages),
                *,
                analyses: AnalysesTypes = frozenset(DEFAULT_CONFIG.analyses),
+               cache_max_entries: Optional[int] = DEFAULT_CONFIG.cache_max_entries,
                cache_redis_connection_url: Optional[str] = DEFAULT_CONFIG.cache_redis_connection_url,
+               cache_redis_ttl: Optional[int] = DEFAULT_CONFIG.cache_redis_ttl,
+               cache_ttl: Optional[float] = DEFAULT_CONFIG.cache_ttl,
                censor_char: str = DEFAULT_CONFIG.censor_char,
                censor_whole_words: bool = DEFAULT_CONFIG.censor_whole_words,
+               compiled_dictionaries_path: Optional[PathOrStr] = DEFAULT_CONFIG.compiled_dictionaries_path,
                custom_profane_word_dictionaries: ProfaneWordDictionariesAcceptable = None,
+               exact_match_prefilter: bool = DEFAULT_CONFIG.exact_match_prefilter,
                extra_profane_word_dictionaries: ProfaneWordDictionariesAcceptable = None,
+               fuzzy_backend: FuzzyBackend = DEFAULT_CONFIG.fuzzy_backend,
                max_relative_distance: float = DEFAULT_CONFIG.max_relative_distance,
                morphs: Optional[Morphs] = None,
                nlps: Optional[Nlps] = None,
                spells: Optional[Spells] = None,
                ):
-        self.analyses = analyses
-        self.cache_redis_connection_url = cache_redis_connection_url
-        self.censor_char = censor_char
-        self.censor_whole_words = censor_whole_words
-        self.custom_profane_word_dictionaries = custom_profane_word_dictionaries
-        self.extra_profane_word_dictionaries = extra_profane_word_dictionaries
-        self.max_relative_distance = max_relative_distance
-        self._set_languages(languages, load_morphs=morphs is None, load_nlps=nlps is None, load_spells=spells is None)
-        if morphs is not None:
-            self.morphs = morphs
-        if nlps is not None:
-            self.nlps = nlps
-        if spells is not None:
-            self.spells = spells
+        with self.batch_config():
+            self.analyses = analyses
+            self.cache_max_entries = cache_max_entries
+            self.cache_redis_ttl = cache_redis_ttl
+            self.cache_ttl = cache_ttl
+            self.cache_redis_connection_url = cache_redis_connection_url
+            self.censor_char = censor_char
+            self.censor_whole_words = censor_whole_words
+            self.compiled_dictionaries_path = compiled_dictionaries_path
+            self.custom_profane_word_dictionaries = custom_profane_word_dictionaries
+            self.exact_match_prefilter = exact_match_prefilter
+            self.extra_profane_word_dictionaries = extra_profane_word_dictionaries
+            self.fuzzy_backend = fuzzy_backend
+            self.max_relative_distance = max_relative_distance
+            self._set_languages(languages, load_morphs=morphs is None, load_nlps=nlps is None,
+                                load_spells=spells is None)
+            if morphs is not None:
+                self.morphs = morphs
+            if nlps is not None:
+                self.nlps = nlps
+            if spells is not None:
+                self.spells = spells
 
     @classmethod
     def from_config(cls, config: Config) -> 'ProfanityFilter':
         return cls(
             languages=config.languages,
             analyses=frozenset(config.analyses),
+            cache_max_entries=config.cache_max_entries,
             cache_redis_connection_url=config.cache_redis_connection_url,
+            cache_redis_ttl=config.cache_redis_ttl,
+            cache_ttl=config.cache_ttl,
             censor_char=config.censor_char,
             censor_whole_words=config.censor_whole_words,
+            compiled_dictionaries_path=config.compiled_dictionaries_path,
+            exact_match_prefilter=config.exact_match_prefilter,
+            fuzzy_backend=config.fuzzy_backend,
             max_relative_distance=config.max_relative_distance,
         )
 
@@ -199,9 +324,52 @@ class ProfanityFilter:
         """Returns text with any profane words censored"""
         return self._censor(text=text, return_bool=False)
 
-    def censor_word(self, word: Union[str, spacy.tokens.Token], language: Language = None) -> Word:
+    def censor_many(self, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[str]:
+        """Returns texts with any profane words censored in the same order, parsing them in batches"""
+        return self._censor_many(texts=texts, return_bool=False, batch_size=batch_size)
+
+    def censor_many_with_spans(self, texts: Iterable[str],
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> List[CensoredText]:
+        """Returns censored texts with positions of profane words in the same order as texts"""
+        texts = list(texts)
+        texts_spans = self._get_censored_spans(texts=texts, batch_size=batch_size)
+        return [CensoredText(uncensored=text, censored=self._apply_censored_spans(text=text, spans=spans), spans=spans)
+                for text, spans in zip(texts, texts_spans)]
+
+    def censor_with_spans(self, text: str) -> CensoredText:
+        """Returns censored text with positions of profane words"""
+        [result] = self.censor_many_with_spans(texts=[text])
+        return result
+
+    def censor_stream(self, chunks: Iterable[str], buffer_size: int = STREAM_BUFFER_SIZE) -> Iterable[str]:
+        """Yields censored text of the stream of chunks keeping at most about `buffer_size` chars in memory
+
+        Text is censored up to the last whitespace of the buffer, so words split across chunks are censored as
+        a whole, unless a word is longer than the buffer.
+        """
+        buffer: List[str] = []
+        buffer_length = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffer_length += len(chunk)
+            if buffer_length < buffer_size:
+                continue
+            text = ''.join(buffer)
+            finish = len(text)
+            while finish > 0 and not text[finish - 1].isspace():
+                finish -= 1
+            if finish == 0:
+                finish = len(text)
+            yield self.censor(text[:finish])
+            buffer = [text[finish:]]
+            buffer_length = len(buffer[0])
+        if buffer_length:
+            yield self.censor(''.join(buffer))
+
+    def censor_word(self, word: Union[str, 'spacy.tokens.Token'], language: Language = None) -> Word:
         """Returns censored word"""
-        word = self._make_spacy_token(language=language, word=word)
+        self._swap_in_reloaded_dictionaries()
+        word = self._make_token(language=language, word=word)
         return self._censor_word(language=language, word=word)
 
     def is_clean(self, text: str) -> bool:
@@ -209,13 +377,30 @@ class ProfanityFilter:
         return not self.is_profane(text=text)
 
     def is_profane(self, text: str) -> bool:
-        """Returns True if input_text contains any profane words, False otherwise"""
-        return self._censor(text=text, return_bool=True)
+        """Returns True if input_text contains any profane words, False otherwise
+
+        Stops at the first profane word without analyzing the rest of text.
+        """
+        return self._is_profane(text=text)
+
+    def is_profane_many(self, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[bool]:
+        """Returns list of flags (True if text contains any profane words) in the same order as texts"""
+        return self._censor_many(texts=texts, return_bool=True, batch_size=batch_size)
+
+    def pool(self, processes: Optional[int] = None, chunk_size: int = DEFAULT_BATCH_SIZE) -> 'ProfanityFilterPool':
+        """Returns pool of worker processes for censoring batches of texts in parallel"""
+        from profanity_filter.pool import ProfanityFilterPool
+        return ProfanityFilterPool(profanity_filter=self, processes=processes, chunk_size=chunk_size)
+
+    def watch_dictionaries(self, interval: float = 1.0) -> 'DictionariesWatcher':
+        """Starts reloading profane word dictionaries in the background when their files change"""
+        from profanity_filter.watcher import DictionariesWatcher
+        return DictionariesWatcher(profanity_filter=self, interval=interval).start()
 
     @cached_property
     def spacy_component(self, language: Language = None) -> SpacyProfanityFilterComponent:
         nlp = self._get_nlp(language)
-        [language] = [language for language, nlp_ in self.nlps.items() if nlp_ == nlp]
+        [language] = [language for language, nlp_ in self._nlps.items() if nlp_ is nlp]
         return SpacyProfanityFilterComponent(profanity_filter=self, nlp=nlp, language=language)
 
     @property
@@ -224,8 +409,18 @@ class ProfanityFilter:
 
     @analyses.setter
     def analyses(self, value: Collection[AnalysisType]) -> None:
-        self._analyses = AVAILABLE_ANALYSES.intersection(value)
-        self.clear_cache()
+        self._analyses = frozenset(analysis for analysis in value if _import_analysis(analysis))
+        self._invalidate('dictionaries', 'words')
+
+    @property
+    def cache_max_entries(self) -> Optional[int]:
+        """Max number of entries of every in-process cache (None - unbounded)"""
+        return self._cache_max_entries
+
+    @cache_max_entries.setter
+    def cache_max_entries(self, value: Optional[int]) -> None:
+        self._cache_max_entries = value
+        self._invalidate('caches')
 
     @property
     def cache_redis_connection_url(self) -> Optional[str]:
@@ -234,8 +429,40 @@ class ProfanityFilter:
     @cache_redis_connection_url.setter
     def cache_redis_connection_url(self, value: Optional[str]) -> None:
         self._cache_redis_connection_url = value
-        if value is not None:
+        if value is None:
+            self._cache_redis = None
+        else:
+            from redis import Redis
             self._cache_redis = Redis.from_url(value)
+        self._invalidate('caches')
+
+    @property
+    def cache_redis_ttl(self) -> Optional[int]:
+        """Time to live of Redis cache keys in seconds"""
+        return self._cache_redis_ttl
+
+    @cache_redis_ttl.setter
+    def cache_redis_ttl(self, value: Optional[int]) -> None:
+        self._cache_redis_ttl = value
+        self._invalidate('caches')
+
+    @property
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        """Hits, misses and evictions of in-process caches"""
+        return {'tokens': self._tokens.stats, 'fuzzy_matches': self._fuzzy_matches.stats,
+                'spell': self._spell_results.stats, 'stem': self._stem_results.stats,
+                'parse': self._parse_results.stats, 'detected_languages': self._detected_languages.stats,
+                **self._words_cache.stats}
+
+    @property
+    def cache_ttl(self) -> Optional[float]:
+        """Time to live of entries of in-process caches in seconds (None - forever)"""
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value: Optional[float]) -> None:
+        self._cache_ttl = value
+        self._invalidate('caches')
 
     @property
     def censor_char(self) -> str:
@@ -248,7 +475,7 @@ class ProfanityFilter:
         if len(value) != 1:
             raise ValueError("Censor char must be str of length 1")
         self._censor_char = value
-        self.clear_cache()
+        self._invalidate('words')
 
     @property
     def censor_whole_words(self) -> bool:
@@ -257,7 +484,19 @@ class ProfanityFilter:
     @censor_whole_words.setter
     def censor_whole_words(self, value: bool) -> None:
         self._censor_whole_words = value
-        self.clear_cache()
+        self._invalidate('words')
+
+    @property
+    def compiled_dictionaries_path(self) -> Optional[Path]:
+        """File to load compiled dictionaries from (they are compiled and saved there if file is missing or stale)"""
+        return self._compiled_dictionaries_path
+
+    @compiled_dictionaries_path.setter
+    def compiled_dictionaries_path(self, value: Optional[PathOrStr]) -> None:
+        self._compiled_dictionaries_path = None if value is None else Path(value)
+        # Load from the new file or save there
+        self._compiled_dictionaries = None
+        self._invalidate('dictionaries')
 
     @property
     def custom_profane_word_dictionaries(self) -> ProfaneWordDictionaries:
@@ -272,7 +511,17 @@ class ProfanityFilter:
             value = {language: OrderedSet(custom_censor_dictionary)
                      for language, custom_censor_dictionary in value.items()}
         self._custom_profane_word_dictionaries = defaultdict(lambda: OrderedSet(), **value)
-        self.clear_cache()
+        self._invalidate('dictionaries', 'words')
+
+    @property
+    def exact_match_prefilter(self) -> bool:
+        """If True, only the regions of text containing exact dictionary matches are analyzed"""
+        return self._exact_match_prefilter
+
+    @exact_match_prefilter.setter
+    def exact_match_prefilter(self, value: bool) -> None:
+        self._exact_match_prefilter = value
+        self._invalidate('dictionaries')
 
     @property
     def extra_profane_word_dictionaries(self) -> ProfaneWordDictionaries:
@@ -287,7 +536,17 @@ class ProfanityFilter:
             value = {language: OrderedSet(extra_profane_word_dictionary)
                      for language, extra_profane_word_dictionary in value.items()}
         self._extra_profane_word_dictionaries = defaultdict(lambda: OrderedSet(), **value)
-        self.clear_cache()
+        self._invalidate('dictionaries', 'words')
+
+    @property
+    def fuzzy_backend(self) -> FuzzyBackend:
+        """How deep analysis finds profane words within the max distance"""
+        return self._fuzzy_backend
+
+    @fuzzy_backend.setter
+    def fuzzy_backend(self, value: FuzzyBackend) -> None:
+        self._fuzzy_backend = FuzzyBackend(value)
+        self._invalidate('dictionaries', 'words')
 
     @property
     def languages(self) -> Languages:
@@ -310,112 +569,276 @@ class ProfanityFilter:
     @max_relative_distance.setter
     def max_relative_distance(self, value: float) -> None:
         self._max_relative_distance = value
-        self.clear_cache()
+        self._invalidate('words')
 
     @property
     def morphs(self) -> Morphs:
+        """Morphological analyzers of all languages (loads them if not loaded yet)"""
+        for language in self.languages:
+            self._load_morph(language)
         return self._morphs
 
     @morphs.setter
     def morphs(self, value: Optional[Morphs]) -> None:
         if AnalysisType.MORPHOLOGICAL in self.analyses:
-            self.clear_cache()
-            if value is not None:
-                self._morphs = value
-            else:
-                self._morphs = {}
-                for language in self.languages:
-                    with suppress(ValueError):
-                        self._morphs[language] = MorphAnalyzer(lang=language)
-                if not self._morphs:
-                    self.analyses -= {AnalysisType.MORPHOLOGICAL}
+            self._set_models('morphs', value)
+            self._parse_results.clear()
+            self._invalidate('words')
 
     @property
     def nlps(self) -> Nlps:
+        """Spacy models of all languages (loads them if not loaded yet)"""
+        for language in self.languages:
+            self._load_nlp(language)
+        if not self._nlps:
+            raise ProfanityFilterError(f"Couldn't load Spacy model for any of languages: {self.languages_str}")
         return self._nlps
 
     @nlps.setter
     def nlps(self, value: Optional[Nlps]) -> None:
-        self.clear_cache()
-        if value is not None:
-            self._nlps = value
-        else:
-            self._nlps = {}
-            for language in self.languages:
-                with suppress(OSError):
-                    self._nlps[language] = spacy.load(language, disable=['parser', 'ner'])
-                    self._nlps[language].add_pipe(self.spacy_component, last=True)
-            if not self._nlps:
-                raise ProfanityFilterError(f"Couldn't load Spacy model for any of languages: {self.languages_str}")
+        self._set_models('nlps', value)
+        self._invalidate('words')
 
     @cached_property
     def profane_word_dictionaries(self) -> ProfaneWordDictionaries:
         """Gets profane word dictionaries"""
-        if self.custom_profane_word_dictionaries:
-            result = deepcopy(self.custom_profane_word_dictionaries)
-        else:
-            self._load_profane_word_dictionaries()
-            result = deepcopy(self._censor_dictionaries)
+        key = self._get_compiled_dictionaries_key()
+        compiled_dictionaries = self._compiled_dictionaries
+        if compiled_dictionaries is None or compiled_dictionaries.key != key:
+            compiled_dictionaries = self._load_or_compile_dictionaries(key=key)
+            self._compiled_dictionaries = compiled_dictionaries
 
-        for language in self.languages.intersection(list(self.extra_profane_word_dictionaries.keys())):
-            result[language] |= self.extra_profane_word_dictionaries[language]
+        if AnalysisType.DEEP in self.analyses and self.fuzzy_backend == FuzzyBackend.TRIE:
+            _generate_automata_files(self._MAX_MAX_DISTANCE)
 
-        if AnalysisType.DEEP in self.analyses:
-            self._trie = {language: Trie(words=result[language], alphabet=self._alphabet)
-                          for language in self.languages}
-            for length in range(self._MAX_MAX_DISTANCE + 1):
-                generate_automaton_to_file(length)
+        return compiled_dictionaries.dictionaries
 
-        return result
+    @property
+    def removed_profane_words(self) -> ProfaneWordDictionaries:
+        """Words removed with `remove_words`, excluded from custom, bundled and extra dictionaries"""
+        return self._removed_profane_words
 
     @property
     def spells(self) -> Spells:
+        """Spell checkers of all languages (loads them if not loaded yet)"""
+        for language in self.languages:
+            self._load_spell(language)
         return self._spells
 
     @spells.setter
     def spells(self, value: Optional[Spells]) -> None:
         if AnalysisType.DEEP in self.analyses:
-            self.clear_cache()
-            if value is not None:
-                self._spells = value
-            else:
-                self._spells = {}
-                for language in self._languages:
-                    with suppress(HunSpellError):
-                        self._spells[language] = HunSpell(self._DATA_DIR / f'{language}.dic',
-                                                          self._DATA_DIR / f'{language}.aff')
-                if not self._spells:
-                    self.analyses -= {AnalysisType.DEEP}
+            self._set_models('spells', value)
+            self._spell_results.clear()
+            self._stem_results.clear()
+            self._invalidate('words')
+            if value is None and not any(self._get_spell_files(language)[0].is_file() for language in self.languages):
+                self.analyses -= {AnalysisType.DEEP}
+
+    def warm_up(self) -> None:
+        """Loads models of all languages and compiles dictionaries, which are otherwise loaded on first use
+
+        Call it before forking worker processes, so that they share loaded models instead of loading their own copies.
+        """
+        _ = self.nlps
+        if AnalysisType.DEEP in self.analyses:
+            _ = self.spells
+        if AnalysisType.MORPHOLOGICAL in self.analyses:
+            _ = self.morphs
+        _ = self.profane_word_dictionaries
 
     def clear_cache(self) -> None:
-        if self._cache_clearing_disabled:
-            return
+        self._invalidate('dictionaries', 'words')
 
-        self._update_profane_word_dictionary_files()
-        self._update_profane_word_dictionaries()
-        self._clear_words_cache()
+    def update(self, **changes) -> None:
+        """Changes several settings (keyword arguments of the constructor) with a single rebuild of caches
+
+        Either all settings are changed or, if any of them is invalid, none of them.
+        """
+        unknown = changes.keys() - inspect.signature(self.config).parameters.keys()
+        if unknown:
+            raise TypeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        state = self._get_state()
+        try:
+            with self.batch_config():
+                # Models are loaded according to analyses and languages
+                if 'analyses' in changes:
+                    self.analyses = changes.pop('analyses')
+                if 'languages' in changes:
+                    self._set_languages(changes.pop('languages'), load_morphs='morphs' not in changes,
+                                        load_nlps='nlps' not in changes, load_spells='spells' not in changes)
+                for name, value in changes.items():
+                    setattr(self, name, value)
+        except Exception:
+            self._set_state(state)
+            raise
+
+    @contextmanager
+    def batch_config(self) -> ContextManager[None]:
+        """Settings changed inside the block are applied with a single rebuild of caches on exit"""
+        try:
+            with self._disabled_cache_clearing():
+                yield
+        finally:
+            self._invalidate()
 
     def restore_profane_word_dictionaries(self) -> None:
         """ Clears all custom censor lists """
+        self._removed_profane_words = defaultdict(lambda: OrderedSet())
         self.custom_profane_word_dictionaries = None
         self.extra_profane_word_dictionaries = None
 
+    def add_words(self, language: Language, words: Collection[str]) -> None:
+        """Adds profane words to extra dictionary of language, updating compiled dictionaries in place
+
+        Only cached words that may contain the added words are dropped from the cache.
+        """
+        words = OrderedSet(words)
+        self._extra_profane_word_dictionaries[language] |= words
+        if language in self._removed_profane_words:
+            self._removed_profane_words[language] -= words
+        self._update_dictionary_in_place(language=language, added=words, removed=OrderedSet())
+
+    def remove_words(self, language: Language, words: Collection[str]) -> None:
+        """Removes profane words of language, updating compiled dictionaries in place
+
+        Words are removed from extra dictionary and excluded from custom dictionaries and dictionaries from the data
+        dir, which are left unchanged. Only cached censored words that may contain the removed words are dropped from
+        the cache.
+        """
+        words = OrderedSet(words)
+        if language in self._extra_profane_word_dictionaries:
+            self._extra_profane_word_dictionaries[language] -= words
+        self._removed_profane_words[language] |= words
+        self._update_dictionary_in_place(language=language, added=OrderedSet(), removed=words)
+
+    def _get_state(self) -> Dict[str, Any]:
+        """:return: attributes with copies of mutable collections, to restore settings with `_set_state`"""
+        return {name: copy(value) if isinstance(value, (dict, set)) else value for name, value in self.__dict__.items()}
+
+    def _set_state(self, state: Dict[str, Any]) -> None:
+        self.__dict__.clear()
+        self.__dict__.update(state)
+        # Cached words may have been cleared or moved to the namespace of other settings meanwhile
+        self._invalidate('words')
+
     @contextmanager
     def _disabled_cache_clearing(self) -> ContextManager[None]:
+        cache_clearing_disabled = self._cache_clearing_disabled
         self._cache_clearing_disabled = True
-        yield
-        self._cache_clearing_disabled = False
+        try:
+            yield
+        finally:
+            self._cache_clearing_disabled = cache_clearing_disabled
 
-    def _clear_words_cache(self):
-        self._censored_words = {}
-        self._words_with_no_profanity_inside = set()
-        if self._cache_redis is not None:
-            self._cache_redis.flushdb()
+    def _invalidate(self, *artifacts: str) -> None:
+        """Rebuilds artifacts depending on the changed setting
 
-    def _update_languages_str(self) -> None:
+        Artifacts are: 'caches' (caches are recreated with new limits), 'dictionaries' (compiled profane word
+        dictionaries, they are recompiled only if their key changes) and 'words' (cached results of censoring words).
+        While cache clearing is disabled, artifacts are accumulated and rebuilt once when it's enabled again.
+        """
+        self._pending_invalidations.update(artifacts)
         if self._cache_clearing_disabled:
             return
 
+        pending = self._pending_invalidations
+        self._pending_invalidations = set()
+        if 'caches' in pending:
+            self._update_words_cache()
+        if 'dictionaries' in pending:
+            self._update_profane_word_dictionary_files()
+            self._update_profane_word_dictionaries()
+        if 'caches' in pending or 'words' in pending:
+            self._clear_words_cache()
+
+    def _set_models(self, kind: str, value: Optional[dict]) -> None:
+        """Sets models passed by user or schedules loading of models on first use"""
+        setattr(self, f'_{kind}', {} if value is None else value)
+        self._load_models[kind] = value is None
+        self._model_loading_failed[kind] = set()
+
+    def _load_model(self, kind: str, language: Language, load, errors) -> Optional[object]:
+        """:return: model of language of the given kind, loading it on first use, or None if it's unavailable"""
+        models = getattr(self, f'_{kind}')
+        with suppress(KeyError):
+            return models[language]
+        if (not self._load_models[kind] or language not in self.languages
+                or language in self._model_loading_failed[kind]):
+            return None
+        try:
+            models[language] = load(language)
+        except errors:
+            self._model_loading_failed[kind].add(language)
+            return None
+        return models[language]
+
+    def _load_nlp(self, language: Language) -> Optional['spacy.language.Language']:
+        def load(language_: Language) -> 'spacy.language.Language':
+            import spacy
+            nlp = spacy.load(language_, disable=['parser', 'ner'])
+            nlp.add_pipe(SpacyProfanityFilterComponent(profanity_filter=self, nlp=nlp, language=language_), last=True)
+            return nlp
+
+        return self._load_model('nlps', language, load=load, errors=OSError)
+
+    def _load_morph(self, language: Language) -> Optional['MorphAnalyzer']:
+        morph = self._load_model('morphs', language, load=lambda language_: MorphAnalyzer(lang=language_),
+                                 errors=ValueError)
+        if (morph is None and not self._morphs
+                and self._model_loading_failed['morphs'].issuperset(self.languages)):
+            # Results are the same as without the analysis, so there is no need to clear the cache
+            self._analyses -= {AnalysisType.MORPHOLOGICAL}
+        return morph
+
+    def _load_spell(self, language: Language) -> Optional['HunSpell']:
+        return self._load_model('spells', language, load=lambda language_: HunSpell(*self._get_spell_files(language_)),
+                                errors=(HunSpellError, ) if HunSpellError is not None else ())
+
+    def _get_spell_files(self, language: Language) -> Tuple[Path, Path]:
+        return self._DATA_DIR / f'{language}.dic', self._DATA_DIR / f'{language}.aff'
+
+    def _update_words_cache(self) -> None:
+        self._tokens = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        self._fuzzy_matches = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        self._spell_results = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        self._stem_results = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        self._parse_results = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        self._detected_languages = LRUCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        if self._cache_redis is None:
+            self._words_cache = LocalWordsCache(max_entries=self.cache_max_entries, ttl=self.cache_ttl)
+        else:
+            self._words_cache = RedisWordsCache(self._cache_redis, ttl=self.cache_redis_ttl,
+                                                max_local_entries=self.cache_max_entries)
+
+    def _clear_words_cache(self):
+        self._tokens.clear()
+        self._fuzzy_matches.clear()
+        self._spell_results.clear()
+        self._stem_results.clear()
+        self._parse_results.clear()
+        self._detected_languages.clear()
+        # Namespace is needed only to share the cache between processes, computing it loads all models
+        namespace = self._get_words_cache_namespace() if self._cache_redis is not None else ''
+        self._words_cache.clear(namespace=namespace)
+
+    def _get_words_cache_namespace(self) -> str:
+        """:return: hash of settings affecting censoring of words"""
+        settings = [
+            sorted(analysis.value for analysis in self.analyses),
+            self.censor_char,
+            self.censor_whole_words,
+            self.max_relative_distance,
+            list(self.languages),
+            sorted((str(language), sorted(words)) for language, words in self.profane_word_dictionaries.items()),
+            sorted((str(language), nlp.meta.get('name'), nlp.meta.get('version'))
+                   for language, nlp in self.nlps.items()),
+            sorted((str(language), type(morph).__name__) for language, morph in self.morphs.items()),
+            sorted((str(language), type(spell).__name__) for language, spell in self.spells.items()),
+        ]
+        return hashlib.sha1(repr(settings).encode('utf8')).hexdigest()
+
+    def _update_languages_str(self) -> None:
         with suppress(KeyError):
             del self.__dict__['languages_str']
         _ = self.languages_str
@@ -430,45 +853,288 @@ class ProfanityFilter:
             self.nlps = None
         if load_spells:
             self.spells = None
-        self.clear_cache()
+        self._invalidate('dictionaries', 'words')
 
     def _update_profane_word_dictionary_files(self):
-        # Paths to profane word dictionaries
-        self._profane_word_dictionary_files = {}
+        # Paths to profane word dictionaries (replaced at once, because they may be read by the watcher thread)
+        profane_word_dictionary_files = {}
         for language in self.languages:
             profane_word_file = self._DATA_DIR / f'{language}_profane_words.txt'
             if profane_word_file.is_file():
-                self._profane_word_dictionary_files[language] = profane_word_file
-        if not self._profane_word_dictionary_files:
+                profane_word_dictionary_files[language] = profane_word_file
+        if not profane_word_dictionary_files:
             raise ProfanityFilterError(f"Couldn't load profane words for any of languages: {self.languages_str}")
+        self._profane_word_dictionary_files = profane_word_dictionary_files
 
     def _update_profane_word_dictionaries(self) -> None:
-        if self._cache_clearing_disabled:
-            return
-
         with suppress(KeyError):
             del self.__dict__['profane_word_dictionaries']
         _ = self.profane_word_dictionaries
 
+    def _get_compiled_dictionaries_key(self) -> str:
+        """:return: hash of settings and source files of profane word dictionaries"""
+        source_files = []
+        for language, path in sorted(self._profane_word_dictionary_files.items()):
+            stat = path.stat()
+            source_files.append((str(language), str(path), stat.st_size, stat.st_mtime_ns))
+        settings = [
+            CompiledDictionaries.VERSION,
+            list(self.languages),
+            AnalysisType.DEEP in self.analyses,
+            self.fuzzy_backend.value,
+            self.exact_match_prefilter,
+            sorted((str(language), list(words)) for language, words in self.custom_profane_word_dictionaries.items()),
+            sorted((str(language), list(words)) for language, words in self.extra_profane_word_dictionaries.items()),
+            sorted((str(language), sorted(words)) for language, words in self._removed_profane_words.items()),
+            source_files,
+        ]
+        return hashlib.sha1(repr(settings).encode('utf8')).hexdigest()
+
+    def _load_or_compile_dictionaries(self, key: str) -> CompiledDictionaries:
+        compiled_dictionaries = None
+        if self.compiled_dictionaries_path is not None:
+            compiled_dictionaries = CompiledDictionaries.load(self.compiled_dictionaries_path, key=key)
+        if compiled_dictionaries is None:
+            compiled_dictionaries = self._compile_dictionaries(key=key)
+            if self.compiled_dictionaries_path is not None:
+                # Compiling still works if search structures can't be saved
+                with suppress(OSError, pickle.PicklingError, AttributeError, TypeError):
+                    compiled_dictionaries.dump(self.compiled_dictionaries_path)
+        return compiled_dictionaries
+
+    def _get_compiled_dictionaries(self) -> CompiledDictionaries:
+        _ = self.profane_word_dictionaries
+        return self._compiled_dictionaries
+
+    def _reload_dictionaries(self) -> bool:
+        """Rebuilds compiled dictionaries if their files have changed, called by the watcher thread
+
+        Only new dictionaries are built here, censoring isn't blocked meanwhile. They're swapped in and affected cached
+        words are dropped on the next censoring call (see `_swap_in_reloaded_dictionaries`), because caches are not
+        safe to change while another thread uses them.
+
+        :return: True if dictionaries were reloaded
+        """
+        compiled_dictionaries = self._compiled_dictionaries
+        if compiled_dictionaries is None:
+            return False
+        old_key = compiled_dictionaries.key
+        self._update_profane_word_dictionary_files()
+        key = self._get_compiled_dictionaries_key()
+        if key == old_key:
+            return False
+        reloaded_dictionaries = self._reloaded_dictionaries
+        if reloaded_dictionaries is not None and reloaded_dictionaries.new.key == key:
+            return False
+        new_compiled_dictionaries = self._load_or_compile_dictionaries(key=key)
+
+        added, removed = set(), set()
+        for language in set(compiled_dictionaries.dictionaries) | set(new_compiled_dictionaries.dictionaries):
+            old_words = set(compiled_dictionaries.dictionaries.get(language, ()))
+            new_words = set(new_compiled_dictionaries.dictionaries.get(language, ()))
+            added |= new_words - old_words
+            removed |= old_words - new_words
+        self._reloaded_dictionaries = _ReloadedDictionaries(old=compiled_dictionaries, old_key=old_key,
+                                                            new=new_compiled_dictionaries, added=added, removed=removed)
+        return True
+
+    def _swap_in_reloaded_dictionaries(self) -> None:
+        """Swaps in dictionaries reloaded by the watcher thread and drops cached words affected by the change
+
+        If the watcher publishes newer dictionaries meanwhile, they're dropped here, but the watcher builds them again
+        on the next check, as their key still differs from the key of the dictionaries in use.
+        """
+        reloaded_dictionaries = self._reloaded_dictionaries
+        if reloaded_dictionaries is None or self._words_cache_batch_depth:
+            return
+        self._reloaded_dictionaries = None
+        if (self._compiled_dictionaries is not reloaded_dictionaries.old
+                or reloaded_dictionaries.old.key != reloaded_dictionaries.old_key):
+            # Dictionaries were rebuilt or updated meanwhile, for example, because settings were changed
+            return
+        self._compiled_dictionaries = reloaded_dictionaries.new
+        self.__dict__['profane_word_dictionaries'] = reloaded_dictionaries.new.dictionaries
+        self._drop_cached_words(added=reloaded_dictionaries.added, removed=reloaded_dictionaries.removed)
+
+    def _compile_dictionaries(self, key: str) -> CompiledDictionaries:
+        if self.custom_profane_word_dictionaries:
+            dictionaries = deepcopy(self.custom_profane_word_dictionaries)
+        else:
+            self._load_profane_word_dictionaries()
+            dictionaries = deepcopy(self._censor_dictionaries)
+        # Factory must be picklable to save the dictionaries
+        dictionaries = defaultdict(OrderedSet, dictionaries)
+
+        for language in self.languages.intersection(list(self.extra_profane_word_dictionaries.keys())):
+            dictionaries[language] |= self.extra_profane_word_dictionaries[language]
+        for language in self.languages.intersection(list(self._removed_profane_words.keys())):
+            dictionaries[language] -= self._removed_profane_words[language]
+
+        alphabet = set()
+        tries = {}
+        deletion_indexes = {}
+        bigram_indexes = {}
+        if AnalysisType.DEEP in self.analyses:
+            bigram_indexes = {language: BigramIndex(words=dictionaries[language]) for language in self.languages}
+            if self.fuzzy_backend == FuzzyBackend.TRIE:
+                tries = {language: Trie(words=dictionaries[language], alphabet=alphabet)
+                         for language in self.languages}
+            else:
+                deletion_indexes = {language: DeletionIndex(words=dictionaries[language],
+                                                            max_distance=self._MAX_MAX_DISTANCE)
+                                    for language in self.languages}
+
+        exact_match_automata = {}
+        if self.exact_match_prefilter:
+            exact_match_automata = {language: AhoCorasickAutomaton(words=dictionaries[language])
+                                    for language in self.languages}
+
+        return CompiledDictionaries(key=key, dictionaries=dictionaries, alphabet=alphabet, tries=tries,
+                                    deletion_indexes=deletion_indexes, bigram_indexes=bigram_indexes,
+                                    exact_match_automata=exact_match_automata)
+
     def _load_profane_word_dictionaries(self) -> None:
         """Loads the dictionaries of profane words from files"""
         self._update_profane_word_dictionary_files()
-        self._censor_dictionaries = defaultdict(lambda: OrderedSet())
+        # Replaced at once, because they may be loaded by the watcher thread
+        censor_dictionaries = defaultdict(lambda: OrderedSet())
         for language, words_file in self._profane_word_dictionary_files.items():
             with open(str(words_file)) as f:
-                self._censor_dictionaries[language] = OrderedSet(line.strip() for line in f.readlines())
+                censor_dictionaries[language] = OrderedSet(line.strip() for line in f.readlines())
+        self._censor_dictionaries = censor_dictionaries
+
+    def _update_dictionary_in_place(self, language: Language, added: 'OrderedSet[str]',
+                                    removed: 'OrderedSet[str]') -> None:
+        """Updates compiled dictionary of language after adding or removing words
+
+        Search structures are rebuilt only for the language, and the key of compiled dictionaries is updated, so they
+        are not recompiled from scratch on the next clearing of cache.
+        """
+        if (self._cache_clearing_disabled or 'profane_word_dictionaries' not in self.__dict__
+                or language not in self.languages):
+            self._invalidate('dictionaries', 'words')
+            return
+
+        compiled_dictionaries = self._get_compiled_dictionaries()
+        dictionary = compiled_dictionaries.dictionaries[language]
+        dictionary |= added
+        dictionary -= removed
+        if language in compiled_dictionaries.tries:
+            compiled_dictionaries.tries[language] = Trie(words=dictionary, alphabet=compiled_dictionaries.alphabet)
+        for indexes in (compiled_dictionaries.deletion_indexes, compiled_dictionaries.bigram_indexes):
+            if language in indexes:
+                for word in added:
+                    indexes[language].add(word)
+                for word in removed:
+                    indexes[language].remove(word)
+        if language in compiled_dictionaries.exact_match_automata:
+            compiled_dictionaries.exact_match_automata[language] = AhoCorasickAutomaton(words=dictionary)
+        compiled_dictionaries.key = self._get_compiled_dictionaries_key()
+        self._drop_cached_words(added=added, removed=removed)
+
+    def _drop_cached_words(self, added: Collection[str], removed: Collection[str]) -> None:
+        """Drops cached words that may be censored differently after adding or removing profane words
+
+        Words with no profanity inside may become profane if they contain any of added words, censored words may
+        change if they contain any of added or removed words.
+        """
+        if self._cache_redis is not None:
+            # Namespace of the shared cache depends on dictionaries, so it's switched to the new one
+            self._clear_words_cache()
+            return
+
+        may_contain_added = self._get_may_contain_predicate(added)
+        may_contain_changed = self._get_may_contain_predicate([*added, *removed])
+        # Fuzzy matches are cached by lemmas, which is what the predicate is about
+        self._fuzzy_matches.remove_where(
+            lambda key, profane_words: may_contain_added(key[1]) or any(word in removed for word in profane_words))
+        if self.analyses & {AnalysisType.DEEP, AnalysisType.MORPHOLOGICAL}:
+            # Words are cached as they appear in text, and their stems or normal forms may be far from them
+            self._words_cache.clear()
+            return
+        self._words_cache.drop_words(
+            censored_words=lambda word: word.original_profane_word in removed or may_contain_changed(word.uncensored),
+            words_with_no_profanity_inside=may_contain_added,
+        )
+
+    def _get_may_contain_predicate(self, profane_words: Collection[str]) -> Callable[[str], bool]:
+        """:return: predicate that is True for words that may match any of profane words
+
+        Deep analysis matches words within the max distance, so by the pigeonhole principle any matching word contains
+        one of max distance + 1 parts of the profane word intact. Words are checked also with non-letters removed.
+        """
+        parts_count = self._MAX_MAX_DISTANCE + 1 if AnalysisType.DEEP in self.analyses else 1
+        parts = set()
+        for profane_word in profane_words:
+            profane_word = profane_word.lower()
+            parts.update(profane_word[len(profane_word) * i // parts_count:len(profane_word) * (i + 1) // parts_count]
+                         for i in range(parts_count))
+
+        def may_contain(word: str) -> bool:
+            word = word.lower()
+            letters = ''.join(char for char in word if char.isalpha())
+            return any(part in word or part in letters for part in parts)
+
+        return may_contain
 
     def _get_max_distance(self, length: int) -> float:
         return min(self._MAX_MAX_DISTANCE, floor(self.max_relative_distance * length))
 
-    def _make_spacy_token(self, language: Language, word: str) -> spacy.tokens.Token:
-        return spacy_utlis.make_token(nlp=self._get_nlp(language), word=word)
+    def _make_token(self, language: Language, word: Union[str, Token]) -> Token:
+        if hasattr(word, 'text'):
+            return word
+        result = self._tokens.get((language, word))
+        if result is None:
+            result = spacy_utlis.make_lightweight_token(nlp=self._get_nlp(language), word=word)
+            self._tokens.set((language, word), result)
+        return result
 
     def _drop_fully_censored_words(self, substrings: Substrings) -> Substrings:
         return ((word, start, finish)
                 for word, start, finish in substrings
                 if not all(char == self.censor_char for char in word))
 
+    def _drop_unmatchable_substrings(self, language: Language, word: str, substrings: Substrings) -> Substrings:
+        """Skips parts of the word that are too short, too long or share too few bigrams with profane words
+
+        The whole word is always kept. Parts that can't be fuzzy matched themselves are kept if they contain parts that
+        can, because a part found clean (for example, by its lemma or the cache) protects its substrings from censoring.
+        """
+        bigram_indexes = self._get_compiled_dictionaries().bigram_indexes
+        # Without language words are matched against dictionaries of all languages
+        bigram_indexes = (list(bigram_indexes.values()) if language is None else
+                          [self._get_search_structure(language=language, structures=bigram_indexes)])
+        if not bigram_indexes or None in bigram_indexes:
+            yield from substrings
+            return
+        lower_word = word.lower()
+        if len(lower_word) != len(word):
+            lower_word = word
+        # Non-letters are dropped from the word before the deep analysis, so match its letters too
+        letters = ''.join(regex.findall(r'\p{letter}', lower_word))
+        letters_before = [0]
+        for char in lower_word:
+            letters_before.append(letters_before[-1] + bool(regex.match(r'\p{letter}', char)))
+        candidates = set()
+        letters_candidates = set()
+        for bigram_index in bigram_indexes:
+            candidates |= bigram_index.find_candidates(lower_word, get_max_distance=self._get_max_distance)
+            if letters != lower_word:
+                letters_candidates |= bigram_index.find_candidates(letters, get_max_distance=self._get_max_distance)
+        if letters_candidates:
+            candidates |= {(start, finish)
+                           for start in range(len(word)) for finish in range(start + 1, len(word) + 1)
+                           if (letters_before[start], letters_before[finish]) in letters_candidates}
+        # Min finish of candidates starting at the position or after it
+        min_finishes = [len(word) + 1] * (len(word) + 1)
+        for start, finish in candidates:
+            min_finishes[start] = min(min_finishes[start], finish)
+        for start in reversed(range(len(word))):
+            min_finishes[start] = min(min_finishes[start], min_finishes[start + 1])
+        for substring, start, finish in substrings:
+            if finish - start == len(word) or min_finishes[start] <= finish:
+                yield substring, start, finish
+
     @staticmethod
     def _drop_substrings(substrings: Substrings) -> Substrings:
         drop_intervals = set()
@@ -480,12 +1146,12 @@ class ProfanityFilter:
                 if drop_start is not None and drop_finish is not None:
                     drop_intervals.add((drop_start, drop_finish))
 
-    def _generate_fully_censored_word(self, word: Union[str, spacy.tokens.Token]) -> str:
+    def _generate_fully_censored_word(self, word: Union[str, Token]) -> str:
         with suppress(AttributeError):
             word = word.text
         return len(word) * self.censor_char
 
-    def _generate_partly_censored_word(self, word: Union[str, spacy.tokens.Token], profane_word: str) -> str:
+    def _generate_partly_censored_word(self, word: Union[str, Token], profane_word: str) -> str:
         def is_delete_or_insert(opcode):
             return opcode[0] in ('delete', 'insert')
 
@@ -501,25 +1167,42 @@ class ProfanityFilter:
         with suppress(AttributeError):
             word = word.text
 
+        # Levenshtein and regex come with dependencies of deep analysis
+        _import_analysis(AnalysisType.DEEP)
         word_part_for_censoring = find_word_part(word.lower(), profane_word)
         return regex.sub(pattern=re.escape(word_part_for_censoring),
                          repl=self._generate_fully_censored_word(word=word_part_for_censoring),
                          string=word,
                          flags=regex.IGNORECASE)
 
-    def _get_nlp(self, language: Language) -> spacy.language.Language:
+    def _get_nlp(self, language: Language) -> 'spacy.language.Language':
         # noinspection PyTypeChecker
         languages = OrderedSet([language]) | self.languages
         for nlp_language in languages:
-            with suppress(KeyError):
-                return self.nlps[nlp_language]
+            nlp = self._load_nlp(nlp_language)
+            if nlp is not None:
+                return nlp
+        raise ProfanityFilterError(f"Couldn't load Spacy model for any of languages: {self.languages_str}")
 
     def _parse(self,
                language: Language,
                text: str,
-               use_profanity_filter: bool = True) -> spacy.tokens.Doc:
+               use_profanity_filter: bool = True,
+               stop_on_first_profane_word: bool = False) -> 'spacy.tokens.Doc':
         nlp = self._get_nlp(language)
-        return spacy_utlis.parse(nlp=nlp, text=text, language=language, use_profanity_filter=use_profanity_filter)
+        return spacy_utlis.parse(nlp=nlp, text=text, language=language, use_profanity_filter=use_profanity_filter,
+                                 stop_on_first_profane_word=stop_on_first_profane_word)
+
+    def _parse_many(self,
+                    language: Language,
+                    texts: Iterable[str],
+                    batch_size: int = DEFAULT_BATCH_SIZE,
+                    use_profanity_filter: bool = True,
+                    stop_on_first_profane_word: bool = False) -> Iterable['spacy.tokens.Doc']:
+        nlp = self._get_nlp(language)
+        return spacy_utlis.parse_many(nlp=nlp, texts=texts, language=language, batch_size=batch_size,
+                                      use_profanity_filter=use_profanity_filter,
+                                      stop_on_first_profane_word=stop_on_first_profane_word)
 
     def _get_spells(self, language: Language) -> 'OrderedSet[HunSpell]':
         result = OrderedSet([DummyHunSpell()])
@@ -530,35 +1213,58 @@ class ProfanityFilter:
         # noinspection PyTypeChecker
         languages = OrderedSet([language]) | self.languages
         for language in languages:
-            with suppress(KeyError):
-                result = OrderedSet([self.spells[language]])
+            spell = self._load_spell(language)
+            if spell is not None:
+                result = OrderedSet([spell])
                 break
         return result
 
+    def _get_analyzer_result(self, results: 'LRUCache[Tuple[Language, str], T]', analysis: AnalysisType,
+                             language: Language, word: str, analyze: Callable[[Language, str], T]) -> T:
+        """:return: result of analyzer, memoized if the analysis is enabled (dummy analyzers are cheaper than cache)"""
+        if analysis not in self.analyses:
+            return analyze(language, word)
+        result = results.get((language, word))
+        if result is None:
+            result = analyze(language, word)
+            results.set((language, word), result)
+        return result
+
     def _stems(self, language: Language, word: str) -> 'OrderedSet[str]':
+        return OrderedSet(self._get_analyzer_result(self._stem_results, AnalysisType.DEEP, language=language,
+                                                    word=word, analyze=self._stem))
+
+    def _stem(self, language: Language, word: str) -> Tuple[str, ...]:
         spells = self._get_spells(language=language)
         try:
-            return OrderedSet([stem_bytes.decode(spell.get_dic_encoding())
-                               for spell in spells for stem_bytes in spell.stem(word)])
+            return tuple(OrderedSet([stem_bytes.decode(spell.get_dic_encoding())
+                                     for spell in spells for stem_bytes in spell.stem(word)]))
         except UnicodeEncodeError:
-            return OrderedSet()
+            return ()
 
     def _normal_forms(self, language: Language, word: str) -> 'OrderedSet[str]':
+        return OrderedSet([self._get_analyzer_result(self._parse_results, AnalysisType.MORPHOLOGICAL,
+                                                     language=language, word=word, analyze=self._normal_form)])
+
+    def _normal_form(self, language: Language, word: str) -> str:
+        """:return: normal form of the most probable parse of the word"""
         morph = DummyMorphAnalyzer
         if AnalysisType.MORPHOLOGICAL in self.analyses:
             # noinspection PyTypeChecker
             languages = OrderedSet([language]) | self.languages
             for language in languages:
-                with suppress(KeyError):
-                    morph = self.morphs[language]
+                morph = self._load_morph(language)
+                if morph is not None:
                     break
-        return OrderedSet([morph.parse(word=word)[0].normal_form])
+            else:
+                morph = DummyMorphAnalyzer
+        return morph.parse(word=word)[0].normal_form
 
-    def _lemmas(self, language: Language, word: Union[str, spacy.tokens.Token]) -> 'OrderedSet[str]':
+    def _lemmas(self, language: Language, word: Union[str, Token]) -> 'OrderedSet[str]':
         result = OrderedSet()
         if not word:
             return result
-        word = self._make_spacy_token(language=language, word=word)
+        word = self._make_token(language=language, word=word)
         spacy_lemma = word.lemma_
         result.add(word.text)
         spacy_lemma = spacy_lemma.lower() if spacy_lemma != '-PRON-' else word.lower_
@@ -568,12 +1274,16 @@ class ProfanityFilter:
         return result
 
     def _is_dictionary_word(self, language: Language, word: str) -> bool:
+        return self._get_analyzer_result(self._spell_results, AnalysisType.DEEP, language=language, word=word,
+                                         analyze=self._spell)
+
+    def _spell(self, language: Language, word: str) -> bool:
         try:
             return any(spell.spell(word) for spell in self._get_spells(language=language))
         except UnicodeEncodeError:
             return False
 
-    def _keep_only_letters_or_dictionary_word(self, language: Language, word: Union[str, spacy.tokens.Token]) -> str:
+    def _keep_only_letters_or_dictionary_word(self, language: Language, word: Union[str, Token]) -> str:
         with suppress(AttributeError):
             word = word.text
         if language is None:
@@ -583,55 +1293,54 @@ class ProfanityFilter:
         else:
             return ''.join(regex.findall(r'\p{letter}', word))
 
-    def _get_words_with_no_profanity_inside(self) -> Set[str]:
-        if self._cache_redis is None:
-            return self._words_with_no_profanity_inside
-        else:
-            return {word.decode('utf8') for word in self._cache_redis.smembers('_words_with_no_profanity_inside')}
-
     def _has_no_profanity(self, words: Collection[str]) -> bool:
-        return any(word in word_with_no_profanity_inside
-                   for word in words
-                   for word_with_no_profanity_inside in self._get_words_with_no_profanity_inside())
+        return self._words_cache.has_no_profanity(words)
 
-    def _get_trie(self, language: Language) -> Trie:
+    def _get_search_structure(self, language: Language, structures: Dict[Language, T]) -> Optional[T]:
+        """:return: search structure of the language or of the first of languages having it"""
         result = None
         # noinspection PyTypeChecker
         languages = OrderedSet([language]) | self.languages
         for language in languages:
             with suppress(KeyError):
-                result = self._trie[language]
+                result = structures[language]
                 break
         return result
 
+    def _get_fuzzy_matches(self, language: Language, word: str,
+                           compiled_dictionaries: CompiledDictionaries) -> List[str]:
+        """:return: profane words within the max distance to the word, closest first (memoized)"""
+        tolerance = self._get_max_distance(len(word))
+        key = (language, word, tolerance)
+        result = self._fuzzy_matches.get(key)
+        if result is None:
+            if self.fuzzy_backend == FuzzyBackend.SYMSPELL:
+                deletion_index = self._get_search_structure(language=language,
+                                                            structures=compiled_dictionaries.deletion_indexes)
+                result = [] if deletion_index is None else deletion_index.lookup(word, max_distance=tolerance)
+            else:
+                automaton = LevenshteinAutomaton(tolerance=tolerance, query_word=word,
+                                                 alphabet=compiled_dictionaries.alphabet)
+                trie = self._get_search_structure(language=language, structures=compiled_dictionaries.tries)
+                result = trie_automaton_intersection(automaton=automaton, trie=trie, include_error=False)
+                # The first fitting match is used for censoring, so matches are ordered as by the deletion index
+                result = sorted(result, key=lambda match: (Levenshtein.distance(word, match), match))
+            self._fuzzy_matches.set(key, result)
+        return result
+
     def _is_profane_word(self, language: Language, word: str) -> bool:
         profane_word_dictionaries = (self.profane_word_dictionaries.values()
                                      if language is None else
                                      [self.profane_word_dictionaries[language]])
         return any(word in profane_word_dictionary for profane_word_dictionary in profane_word_dictionaries)
 
-    def _get_censored_word(self, word: spacy.tokens.Token) -> Optional[Word]:
-        if self._cache_redis is None:
-            return self._censored_words.get(word.text)
-        else:
-            d = self._cache_redis.hgetall(word.text)
-            if not d:
-                return None
-            uncensored, censored, original_profane_word = d[b'uncensored'], d[b'censored'], d[b'original_profane_word']
-            if not original_profane_word:
-                original_profane_word = None
-            return Word(uncensored=uncensored, censored=censored, original_profane_word=original_profane_word)
+    def _get_censored_word(self, word: Token) -> Optional[Word]:
+        return self._words_cache.get_censored_word(word.text)
 
     def _save_censored_word(self, word: Word) -> None:
-        if self._cache_redis is None:
-            self._censored_words[word.uncensored] = word
-        else:
-            d = dict(word)
-            if not word.original_profane_word:
-                d['original_profane_word'] = ''
-            self._cache_redis.hmset(word.uncensored, d)
+        self._words_cache.save_censored_word(word)
 
-    def _censor_word_part(self, language: Language, word: spacy.tokens.Token) -> Tuple[Word, bool]:
+    def _censor_word_part(self, language: Language, word: Token) -> Tuple[Word, bool]:
         """
         :return: Tuple of censored word and flag of no profanity inside
         """
@@ -658,15 +1367,13 @@ class ProfanityFilter:
                 self._save_censored_word(censored_word)
                 return censored_word, False
         if AnalysisType.DEEP in self.analyses:
+            # Alphabet must match the trie, even if dictionaries are reloaded meanwhile
+            compiled_dictionaries = self._get_compiled_dictionaries()
             for lemma in lemmas:
                 if self._is_dictionary_word(language=language, word=lemma):
                     return Word(uncensored=word.text, censored=word.text), True
-                automaton = LevenshteinAutomaton(tolerance=self._get_max_distance(len(lemma)),
-                                                 query_word=lemma,
-                                                 alphabet=self._alphabet)
-                matching_bad_words = trie_automaton_intersection(automaton=automaton,
-                                                                 trie=self._get_trie(language=language),
-                                                                 include_error=False)
+                matching_bad_words = self._get_fuzzy_matches(language=language, word=lemma,
+                                                             compiled_dictionaries=compiled_dictionaries)
                 if matching_bad_words:
                     bad_word = matching_bad_words[0]
                     if self.censor_whole_words:
@@ -678,25 +1385,31 @@ class ProfanityFilter:
                     return censored_word, False
         return Word(uncensored=word.text, censored=word.text), False
 
-    def _save_word_with_no_profanity_inside(self, word: spacy.tokens.Token) -> None:
-        if self._cache_redis is None:
-            self._words_with_no_profanity_inside.add(word.text)
-        else:
-            self._cache_redis.sadd('_words_with_no_profanity_inside', word.text)
+    def _save_word_with_no_profanity_inside(self, word: Token) -> None:
+        self._words_cache.save_word_with_no_profanity_inside(word.text)
+
+    @contextmanager
+    def _words_cache_batch(self, words: Collection[str]) -> ContextManager[None]:
+        """Fetches cached words at once and delays writes to the cache until the end of the batch"""
+        self._swap_in_reloaded_dictionaries()
+        self._words_cache_batch_depth += 1
+        try:
+            with self._words_cache.batch(words):
+                yield
+        finally:
+            self._words_cache_batch_depth -= 1
 
-    def _censor_word(self, language: Language, word: spacy.tokens.Token) -> Word:
+    def _censor_word(self, language: Language, word: Token) -> Word:
         """Returns censored word"""
         censored_word_prev = None
         censored_word = Word(uncensored=word.text, censored=word.text)
         while censored_word != censored_word_prev:
             censored_word_prev = censored_word
-            substrings = (
-                self._drop_substrings(
-                    self._drop_fully_censored_words(
-                        substrings_indexes(censored_word_prev.censored, reverse=True)
-                    )
-                )
-            )
+            substrings = substrings_indexes(censored_word_prev.censored, reverse=True)
+            if AnalysisType.DEEP in self.analyses:
+                substrings = self._drop_unmatchable_substrings(language=language, word=censored_word_prev.censored,
+                                                               substrings=substrings)
+            substrings = self._drop_substrings(self._drop_fully_censored_words(substrings))
             no_profanity_start, no_profanity_finish = None, None
             try:
                 substring = next(substrings)
@@ -705,7 +1418,7 @@ class ProfanityFilter:
                 break
             while True:
                 try:
-                    censored_part = self._make_spacy_token(language=language, word=censored_part)
+                    censored_part = self._make_token(language=language, word=censored_part)
                     censored_censored_part, no_profanity_inside = self._censor_word_part(language=language,
                                                                                          word=censored_part)
                     if no_profanity_inside:
@@ -736,6 +1449,16 @@ class ProfanityFilter:
         return censored_word
 
     def _detect_languages(self, text: str) -> Languages:
+        """:return: languages of text ordered by confidence (cached for short texts)"""
+        if AnalysisType.MULTILINGUAL not in self.analyses or len(text) > DETECTION_CACHE_MAX_TEXT_LENGTH:
+            return self._get_text_languages(text=text)
+        result = self._detected_languages.get(text)
+        if result is None:
+            result = tuple(self._get_text_languages(text=text))
+            self._detected_languages.set(text, result)
+        return OrderedSet(result)
+
+    def _get_text_languages(self, text: str) -> Languages:
         fallback_language = self.languages[0]
         fallback_result = OrderedSet([fallback_language])
         if AnalysisType.MULTILINGUAL in self.analyses:
@@ -766,41 +1489,191 @@ class ProfanityFilter:
         return result
 
     def _split_by_language(self, text: str) -> TextSplittedByLanguage:
+        """Splits text into parts of different languages
+
+        Text is split into runs of words written in the same script (Latin, Cyrillic, etc.) and languages are detected
+        once per run. Only runs having several languages are split further.
+        """
         languages = self._detect_languages(text=text)
+        if len(languages) <= 1:
+            return self._split_tokens_by_language(tokens=[text], start=0, finish=1, languages=languages)
         tokens = re.split(r'(\W)', text)
+        runs = self._split_by_script(tokens)
+        if len(runs) == 1:
+            return self._merge_by_language(self._split_tokens_by_language(tokens=tokens, start=0, finish=len(tokens),
+                                                                          languages=languages))
+        return self._merge_by_language([part
+                                        for start, finish in runs
+                                        for part in self._split_tokens_by_language(tokens=tokens, start=start,
+                                                                                   finish=finish)])
+
+    def _split_tokens_by_language(self, tokens: List[str], start: int, finish: int,
+                                  languages: Optional[Languages] = None) -> TextSplittedByLanguage:
+        """Splits text of `tokens[start:finish]` in halves until every part has a single language"""
+        text = ''.join(tokens[start:finish])
+        if languages is None:
+            languages = self._detect_languages(text=text)
         if len(languages) == 0:
             return [(None, text)]
-        elif len(languages) == 1 or len(tokens) <= 1:
+        elif len(languages) == 1 or finish - start <= 1:
             # noinspection PyTypeChecker
             return [(languages[0], text)]
         else:
-            middle_index = len(tokens) // 2
-            left_text, right_text, = ''.join(tokens[:middle_index]), ''.join(tokens[middle_index:])
-            left = self._split_by_language(text=left_text)
-            right = self._split_by_language(text=right_text)
-            return ProfanityFilter._merge_by_language(left + right)
+            middle = (start + finish) // 2
+            return (self._split_tokens_by_language(tokens=tokens, start=start, finish=middle) +
+                    self._split_tokens_by_language(tokens=tokens, start=middle, finish=finish))
 
     @staticmethod
-    def _replace_token(text: str, old: spacy.tokens.Token, new: str) -> str:
-        return text[:old.idx] + new + text[old.idx + len(old.text):]
+    def _split_by_script(tokens: List[str]) -> List[Tuple[int, int]]:
+        """:return: (start, finish) of runs of tokens written in the same script, tokens without letters are attached
+        to the preceding run"""
+        result = []
+        run_start = 0
+        run_script = None
+        for i, token in enumerate(tokens):
+            script = ProfanityFilter._get_script(token)
+            if script is None:
+                continue
+            if run_script is not None and script != run_script:
+                result.append((run_start, i))
+                run_start = i
+            run_script = script
+        result.append((run_start, len(tokens)))
+        return result
+
+    @staticmethod
+    def _get_script(word: str) -> Optional[str]:
+        """:return: script of the first letter of word (e.g. 'LATIN' or 'CYRILLIC') or None if it has no letters"""
+        for char in word:
+            if char.isalpha():
+                return unicodedata.name(char, '').partition(' ')[0] or None
+        return None
+
+    def _get_exact_match_automata(self, language: Language) -> List[AhoCorasickAutomaton]:
+        exact_match_automata = self._get_compiled_dictionaries().exact_match_automata
+        if language is None:
+            return list(exact_match_automata.values())
+        # noinspection PyTypeChecker
+        languages = OrderedSet([language]) | self.languages
+        for language in languages:
+            with suppress(KeyError):
+                return [exact_match_automata[language]]
+        return []
+
+    def _get_regions_to_parse(self, language: Language, text: str) -> List[Tuple[int, int]]:
+        """:return: (start, finish) of whitespace delimited regions that should be analyzed"""
+        if not self.exact_match_prefilter:
+            return [(0, len(text))]
+        result = []
+        for automaton in self._get_exact_match_automata(language=language):
+            region_finish = 0
+            for match_start, match_finish in automaton.iter_matches(text):
+                if match_finish <= region_finish:
+                    continue
+                region_start = match_start
+                while region_start > 0 and not text[region_start - 1].isspace():
+                    region_start -= 1
+                region_finish = match_finish
+                while region_finish < len(text) and not text[region_finish].isspace():
+                    region_finish += 1
+                result.append((region_start, region_finish))
+        result.sort()
+        merged = []
+        for region_start, region_finish in result:
+            if merged and region_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], region_finish))
+            else:
+                merged.append((region_start, region_finish))
+        return merged
+
+    @staticmethod
+    def _split_at_whitespace(text: str, chunk_size: int) -> Iterable[str]:
+        """Yields consecutive chunks of text of at least `chunk_size` chars (except the last one) ending before
+        whitespace, so that no word is split"""
+        start = 0
+        while start < len(text):
+            finish = start + chunk_size
+            while finish < len(text) and not text[finish].isspace():
+                finish += 1
+            yield text[start:finish]
+            start = finish
+
+    @staticmethod
+    def _apply_censored_spans(text: str, spans: List[CensoredSpan]) -> str:
+        """Builds censored text in one pass from sorted non-overlapping spans"""
+        fragments = []
+        position = 0
+        for span in spans:
+            fragments.append(text[position:span.start])
+            fragments.append(span.censored)
+            position = span.end
+        fragments.append(text[position:])
+        return ''.join(fragments)
 
-    # noinspection PyProtectedMember
     def _censor(self, text: str, return_bool=False) -> Union[str, bool]:
         """:return: text with any profane words censored or bool (True - text has profane words, False otherwise) if
         return_bool=True"""
-        result = ''
-        text_parts = self._split_by_language(text=text)
-        for language, text_part in text_parts:
-            result_part = text_part
-            doc = self._parse(language=language, text=text_part)
-            for token in doc:
-                if token._.is_profane:
-                    if return_bool:
+        [result] = self._censor_many(texts=[text], return_bool=return_bool)
+        return result
+
+    # noinspection PyProtectedMember
+    def _is_profane(self, text: str) -> bool:
+        """Parses text chunk by chunk and stops on the first profane word"""
+        self._swap_in_reloaded_dictionaries()
+        for language, text_part in self._split_by_language(text=text):
+            for region_start, region_finish in self._get_regions_to_parse(language=language, text=text_part):
+                region = text_part[region_start:region_finish]
+                for chunk in self._split_at_whitespace(region, chunk_size=DETECTION_CHUNK_SIZE):
+                    if self._parse(language=language, text=chunk, stop_on_first_profane_word=True)._.is_profane:
                         return True
-                    else:
-                        result_part = self._replace_token(text=result_part, old=token, new=token._.censored)
-            result += result_part
+        return False
+
+    def _censor_many(self,
+                     texts: Iterable[str],
+                     return_bool=False,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Union[List[str], List[bool]]:
+        """:return: texts with any profane words censored or bools (True - text has profane words, False otherwise) if
+        return_bool=True"""
+        texts = list(texts)
+        # Only the first profane word of a region is needed for detection
+        texts_spans = self._get_censored_spans(texts=texts, batch_size=batch_size,
+                                               stop_on_first_profane_word=return_bool)
         if return_bool:
-            return False
+            return [bool(spans) for spans in texts_spans]
         else:
-            return result
+            return [self._apply_censored_spans(text=text, spans=spans) for text, spans in zip(texts, texts_spans)]
+
+    # noinspection PyProtectedMember
+    def _get_censored_spans(self,
+                            texts: List[str],
+                            batch_size: int = DEFAULT_BATCH_SIZE,
+                            stop_on_first_profane_word: bool = False) -> List[List[CensoredSpan]]:
+        """:return: sorted spans of profane words of every text"""
+        self._swap_in_reloaded_dictionaries()
+        # Equal regions of all texts are parsed only once
+        regions: Dict[Language, Dict[str, List[Tuple[int, int]]]] = defaultdict(lambda: defaultdict(list))
+        for text_index, text in enumerate(texts):
+            part_start = 0
+            for language, text_part in self._split_by_language(text=text):
+                for region_start, region_finish in self._get_regions_to_parse(language=language, text=text_part):
+                    region = text_part[region_start:region_finish]
+                    regions[language][region].append((text_index, part_start + region_start))
+                part_start += len(text_part)
+        result: List[List[CensoredSpan]] = [[] for _ in texts]
+        for language, language_regions in regions.items():
+            docs = self._parse_many(language=language, texts=language_regions.keys(), batch_size=batch_size,
+                                    stop_on_first_profane_word=stop_on_first_profane_word)
+            for doc, occurrences in zip(docs, language_regions.values()):
+                for token in doc:
+                    if token._.is_profane:
+                        for text_index, region_start in occurrences:
+                            start = region_start + token.idx
+                            result[text_index].append(CensoredSpan(
+                                start=start,
+                                end=start + len(token.text),
+                                censored=token._.censored,
+                                original_profane_word=token._.original_profane_word,
+                            ))
+        for spans in result:
+            spans.sort(key=lambda span: span.start)
+        return result
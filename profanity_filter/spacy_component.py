@@ -1,19 +1,22 @@
 from contextlib import suppress
-from typing import Union, Optional, Generator, List
+from typing import Union, Optional, Generator, List, Iterable, TYPE_CHECKING
 
-import spacy.language
-from more_itertools import partitions
-from spacy.tokens import Doc, Span, Token
+from more_itertools import partitions, chunked
+from ordered_set import OrderedSet
 
 from profanity_filter import spacy_utlis
 from profanity_filter.types_ import Language
 
+if TYPE_CHECKING:
+    import spacy.language
+    from spacy.tokens import Doc, Span, Token
+
 
 class SpacyProfanityFilterComponent:
     name = 'profanity_filter'
 
     # noinspection PyUnresolvedReferences
-    def __init__(self, profanity_filter: 'ProfanityFilter', nlp: spacy.language.Language, language: Language = None,
+    def __init__(self, profanity_filter: 'ProfanityFilter', nlp: 'spacy.language.Language', language: Language = None,
                  stop_on_first_profane_word: bool = False):
         self._language = language
         self._nlp = nlp  # Used only for tokenization
@@ -21,7 +24,8 @@ class SpacyProfanityFilterComponent:
         self._stop_on_first_profane_word = stop_on_first_profane_word
 
     # noinspection PyProtectedMember
-    def __call__(self, doc: Doc, language: Language = None, stop_on_first_profane_word: Optional[bool] = None) -> Doc:
+    def __call__(self, doc: 'Doc', language: Language = None,
+                 stop_on_first_profane_word: Optional[bool] = None) -> 'Doc':
         self.register_extensions(exist_ok=True)
         if language is None:
             language = self._language
@@ -29,19 +33,28 @@ class SpacyProfanityFilterComponent:
             stop_on_first_profane_word = self._stop_on_first_profane_word
         i = 0
         while i < len(doc):
-            j = i + 1
-            while (j < len(doc)
-                   and not doc[j - 1].whitespace_ and not doc[j - 1].is_space and not doc[j - 1].is_punct
-                   and not doc[j].is_space and not doc[j].is_punct):
-                j += 1
+            j = self._get_spaceless_span_end(doc, i)
             span = self._censor_spaceless_span(doc[i:j], language=language)
             if stop_on_first_profane_word and span._.is_profane:
                 break
             i += len(span)
         return doc
 
+    # noinspection PyProtectedMember
+    def pipe(self, docs: Iterable['Doc'], batch_size: int = 1000, language: Language = None,
+             stop_on_first_profane_word: Optional[bool] = None) -> Generator['Doc', None, None]:
+        for batch in chunked(docs, batch_size):
+            words = OrderedSet(self._get_spaceless_span_text(span) for doc in batch
+                               for span in self._get_spaceless_spans(doc))
+            with self._profanity_filter._words_cache_batch(words):
+                batch = [self(doc, language=language, stop_on_first_profane_word=stop_on_first_profane_word)
+                         for doc in batch]
+            yield from batch
+
     @staticmethod
     def register_extensions(exist_ok: bool = False) -> None:
+        from spacy.tokens import Doc, Span, Token
+
         def do() -> None:
             Token.set_extension('censored', default=None)
             Token.set_extension('is_profane', getter=SpacyProfanityFilterComponent.token_is_profane)
@@ -57,25 +70,47 @@ class SpacyProfanityFilterComponent:
             do()
 
     @staticmethod
-    def token_is_profane(token: Token) -> bool:
+    def token_is_profane(token: 'Token') -> bool:
         # noinspection PyProtectedMember
-        return token._.censored != token.text
+        # Tokens after the first profane word are not censored when stopping on it
+        return token._.censored is not None and token._.censored != token.text
 
     @staticmethod
-    def tokens_are_profane(tokens: Union[Doc, Span]) -> bool:
+    def tokens_are_profane(tokens: Union['Doc', 'Span']) -> bool:
         # noinspection PyProtectedMember
         return any(token._.is_profane for token in tokens)
 
-    def _span_partitions(self, span: Span) -> Generator[List[Token], None, None]:
+    @staticmethod
+    def _get_spaceless_span_end(doc: 'Doc', start: int) -> int:
+        end = start + 1
+        while (end < len(doc)
+               and not doc[end - 1].whitespace_ and not doc[end - 1].is_space and not doc[end - 1].is_punct
+               and not doc[end].is_space and not doc[end].is_punct):
+            end += 1
+        return end
+
+    @staticmethod
+    def _get_spaceless_spans(doc: 'Doc') -> Generator['Span', None, None]:
+        start = 0
+        while start < len(doc):
+            end = SpacyProfanityFilterComponent._get_spaceless_span_end(doc, start)
+            yield doc[start:end]
+            start = end
+
+    @staticmethod
+    def _get_spaceless_span_text(span: 'Span') -> str:
+        return str(span) if len(span) > 1 else span[0].text
+
+    def _span_partitions(self, span: 'Span') -> Generator[List['Token'], None, None]:
         if len(span) == 1:
             return span[0]
         for partition in partitions(span):
             yield [spacy_utlis.make_token(nlp=self._nlp, word=''.join(element)) for element in partition]
 
     # noinspection PyProtectedMember
-    def _censor_spaceless_span(self, span: Span, language: Language) -> Span:
-        token = spacy_utlis.make_token(nlp=self._nlp, word=str(span) if len(span) > 1 else span[0])
-        censored_word = self._profanity_filter.censor_word(word=token, language=language)
+    def _censor_spaceless_span(self, span: 'Span', language: Language) -> 'Span':
+        word = self._get_spaceless_span_text(span) if len(span) > 1 else span[0]
+        censored_word = self._profanity_filter.censor_word(word=word, language=language)
         if censored_word.is_profane:
             with span.doc.retokenize() as retokenizer:
                 retokenizer.merge(span)
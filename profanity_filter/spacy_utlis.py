@@ -1,28 +1,81 @@
-from typing import Union
-
-import spacy.language
-from spacy.tokens import Doc, Token
+from typing import Union, NamedTuple, Iterable, TYPE_CHECKING
 
 from profanity_filter.spacy_component import SpacyProfanityFilterComponent
 from profanity_filter.types_ import Language
 
+if TYPE_CHECKING:
+    import spacy.language
+    from spacy.tokens import Doc, Token
+
 
-def parse(nlp: spacy.language.Language,
+def parse(nlp: 'spacy.language.Language',
           text: str, language: Language = None,
-          use_profanity_filter: bool = False) -> Union[Doc, Token]:
+          use_profanity_filter: bool = False,
+          stop_on_first_profane_word: bool = False) -> Union['Doc', 'Token']:
     disable = [] if use_profanity_filter else [SpacyProfanityFilterComponent.name]
     component_cfg = {}
     if use_profanity_filter:
         component_cfg[SpacyProfanityFilterComponent.name] = {
             'language': language,
+            'stop_on_first_profane_word': stop_on_first_profane_word,
         }
     return nlp(text, disable=disable, component_cfg=component_cfg)
 
 
-def make_token(nlp: spacy.language.Language, word: Union[str, Token]) -> Token:
+def parse_many(nlp: 'spacy.language.Language',
+               texts: Iterable[str],
+               language: Language = None,
+               batch_size: int = 1000,
+               use_profanity_filter: bool = False,
+               stop_on_first_profane_word: bool = False) -> Iterable['Doc']:
+    disable = [] if use_profanity_filter else [SpacyProfanityFilterComponent.name]
+    component_cfg = {}
+    if use_profanity_filter:
+        component_cfg[SpacyProfanityFilterComponent.name] = {
+            'language': language,
+            'stop_on_first_profane_word': stop_on_first_profane_word,
+        }
+    return nlp.pipe(texts, batch_size=batch_size, disable=disable, component_cfg=component_cfg)
+
+
+def make_token(nlp: 'spacy.language.Language', word: Union[str, 'Token']) -> 'Token':
     if hasattr(word, 'text'):
         return word
     doc = parse(nlp=nlp, text=word)
     with doc.retokenize() as retokenizer:
         retokenizer.merge(doc[:])
     return doc[0]
+
+
+class LightweightToken(NamedTuple):
+    """Token-like view of a bare string, built without running Spacy pipeline"""
+    text: str
+    lemma_: str
+    lower_: str
+
+
+def lemmatize(nlp: 'spacy.language.Language', word: str) -> str:
+    """Returns lemma of word using lookup table or exceptions of lemmatizer without part-of-speech tagging
+
+    Suffix rules are not applied, because without part of speech they make up lemmas of unknown words (like "ass"
+    of "asss" or "jum" of "jums"), which then match parts of unrelated cached words.
+    """
+    lemmatizer = getattr(nlp.vocab.morphology, 'lemmatizer', None)
+    if lemmatizer is None:
+        return word
+    lemma = lemmatizer.lookup(word)
+    if lemma != word:
+        return lemma
+    exceptions = lemmatizer.lookups.get_table('lemma_exc', {})
+    for univ_pos in ('verb', 'noun', 'adj'):
+        lemmas = exceptions.get(univ_pos, {}).get(word.lower())
+        if lemmas and lemmas[0] != word.lower():
+            return lemmas[0]
+    return word
+
+
+def make_lightweight_token(nlp: 'spacy.language.Language',
+                           word: Union[str, 'Token']) -> Union['Token', LightweightToken]:
+    if hasattr(word, 'text'):
+        return word
+    return LightweightToken(text=word, lemma_=lemmatize(nlp=nlp, word=word), lower_=word.lower())
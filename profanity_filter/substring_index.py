@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, Iterator, List, Set
+
+
+class SubstringIndex:
+    """Set of words that answers whether a string is a substring of any of them in time independent of set size
+
+    Backed by generalized suffix automaton, which is extended online on every added word.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._words: Set[str] = set()
+        self._next: List[Dict[str, int]] = [{}]
+        self._link: List[int] = [-1]
+        self._length: List[int] = [0]
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str) -> None:
+        if word in self._words:
+            return
+        self._words.add(word)
+        last = 0
+        for char in word:
+            last = self._extend(last, char)
+
+    def contains_substring(self, substring: str) -> bool:
+        """:return: True if substring is a part of any word in the index"""
+        if not self._words:
+            return False
+        state = 0
+        for char in substring:
+            state = self._next[state].get(char)
+            if state is None:
+                return False
+        return True
+
+    def _new_state(self, length: int, link: int = -1, next_: Dict[str, int] = None) -> int:
+        self._next.append({} if next_ is None else dict(next_))
+        self._link.append(link)
+        self._length.append(length)
+        return len(self._next) - 1
+
+    def _clone(self, p: int, q: int, char: str) -> int:
+        clone = self._new_state(length=self._length[p] + 1, link=self._link[q], next_=self._next[q])
+        while p != -1 and self._next[p].get(char) == q:
+            self._next[p][char] = clone
+            p = self._link[p]
+        self._link[q] = clone
+        return clone
+
+    def _extend(self, last: int, char: str) -> int:
+        if char in self._next[last]:
+            q = self._next[last][char]
+            if self._length[last] + 1 == self._length[q]:
+                return q
+            return self._clone(last, q, char)
+        current = self._new_state(length=self._length[last] + 1)
+        p = last
+        while p != -1 and char not in self._next[p]:
+            self._next[p][char] = current
+            p = self._link[p]
+        if p == -1:
+            self._link[current] = 0
+        else:
+            q = self._next[p][char]
+            if self._length[p] + 1 == self._length[q]:
+                self._link[current] = q
+            else:
+                self._link[current] = self._clone(p, q, char)
+        return current
@@ -2,7 +2,6 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Dict, Collection, Generator, Tuple, List, FrozenSet, Union
 
-import spacy.language
 from pydantic import BaseModel
 
 
@@ -23,12 +22,41 @@ class Word(BaseModel):
         return self.censored != self.uncensored
 
 
+class CensoredSpan(BaseModel):
+    """Profane word at text[start:end]"""
+    start: int
+    end: int
+    censored: str
+    original_profane_word: Optional[str] = None
+
+
+class CensoredText(BaseModel):
+    uncensored: str
+    censored: str
+    spans: List[CensoredSpan] = []
+
+    def __str__(self):
+        return self.censored
+
+    @property
+    def is_profane(self) -> bool:
+        return bool(self.spans)
+
+
 class AnalysisType(Enum):
     DEEP = 'deep'
     MORPHOLOGICAL = 'morphological'
     MULTILINGUAL = 'multilingual'
 
 
+class FuzzyBackend(Enum):
+    """How deep analysis finds profane words within the max distance"""
+    # Levenshtein automaton intersected with the trie of profane words
+    TRIE = 'trie'
+    # Index of profane words by variants with deleted chars (SymSpell)
+    SYMSPELL = 'symspell'
+
+
 Words = Dict[str, Word]
 AnalysesTypes = FrozenSet[AnalysisType]
 Language = Optional[str]
@@ -38,9 +66,10 @@ ProfaneWordDictionaries = Dict[Language, ProfaneWordDictionary]
 ProfaneWordDictionariesAcceptable = Optional[Dict[Language, ProfaneWordDictionaryAcceptable]]
 Languages = 'OrderedSet[Language]'
 LanguagesAcceptable = Collection[Language]
-Nlps = Dict[Language, spacy.language.Language]
+Nlps = Dict[Language, 'spacy.language.Language']
 Morphs = Dict[Language, 'MorphAnalyzer']
 Spells = Dict[Language, 'HunSpell']
 Substrings = Generator[Tuple[str, int, int], Tuple[int, int], None]
 TextSplittedByLanguage = List[Tuple[Language, str]]
 PathOrStr = Union[Path, str]
+Token = Union['spacy.tokens.Token', 'LightweightToken']
@@ -0,0 +1,68 @@
+import logging
+import threading
+from typing import Optional
+
+from profanity_filter.profanity_filter import ProfanityFilter
+from profanity_filter.types_ import ProfanityFilterError
+
+
+logger = logging.getLogger(__name__)
+
+
+class DictionariesWatcher:
+    """Reloads profane word dictionaries of the profanity filter when their files change
+
+    Modification time and size of dictionary files are polled every `interval` seconds in the background thread. New
+    dictionaries and search structures are built in the same thread, and the censoring thread swaps them in at once
+    on its next call, so censoring is neither blocked nor sees partly built dictionaries. If files can't be read (for
+    example, while being replaced), the old dictionaries are kept until the next check.
+    """
+
+    def __init__(self, profanity_filter: ProfanityFilter, interval: float = 1.0):
+        self._profanity_filter = profanity_filter
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloads = 0
+
+    def __enter__(self) -> 'DictionariesWatcher':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> 'DictionariesWatcher':
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='profanity-filter-dictionaries-watcher',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """Rebuilds dictionaries if their files have changed, they are swapped in on the next censoring call
+
+        :return: True if dictionaries were reloaded
+        """
+        try:
+            # noinspection PyProtectedMember
+            reloaded = self._profanity_filter._reload_dictionaries()
+        except (OSError, ProfanityFilterError):
+            return False
+        if reloaded:
+            self.reloads += 1
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            # Dictionaries are kept watched even if a check fails unexpectedly
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Couldn't reload profane word dictionaries")
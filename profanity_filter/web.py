@@ -1,28 +1,250 @@
 """RESTful web service for profanity filtering"""
 
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
+from typing import AsyncIterable, Callable, List, Optional, Tuple, TypeVar, Union
 
 import pathlib
 from appdirs import AppDirs
-from fastapi import FastAPI, Path
+from fastapi import Body, FastAPI, HTTPException, Path
+from more_itertools import chunked
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
 
-from profanity_filter.config import DEFAULT_CONFIG
+from profanity_filter.config import Config, DEFAULT_CONFIG, WebConfig
 from profanity_filter.profanity_filter import ProfanityFilter, APP_NAME
-from profanity_filter.types_ import Word
+from profanity_filter.types_ import CensoredSpan, Word
 
 
-def create_profanity_filter() -> ProfanityFilter:
+# Max number of texts of NDJSON stream censored at once
+STREAM_BATCH_SIZE = 100
+
+T = TypeVar('T')
+
+
+class CensorResult(BaseModel):
+    uncensored: str
+    censored: str
+    is_profane: bool
+    spans: List[CensoredSpan]
+
+
+class LineError(BaseModel):
+    error: str
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response that is produced while the request body is still being read
+
+    Unlike `StreamingResponse` of recent Starlette versions, it doesn't listen for client disconnect, which would
+    consume the request body.
+    """
+    media_type = 'application/x-ndjson'
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        async for chunk in self.body_iterator:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode(self.charset)
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        if self.background is not None:
+            await self.background()
+
+
+class BoundedExecutor:
+    """Runs functions in worker processes, so that censoring doesn't block the event loop
+
+    Calls above `workers + max_queue_size` in flight and calls not finished in `timeout` seconds are rejected with
+    503 Service Unavailable. Where `fork` start method is available, workers inherit the loaded profanity filter.
+    """
+
+    def __init__(self, config: WebConfig):
+        context = (multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else
+                   multiprocessing.get_context())
+        self.workers = config.workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._max_in_flight = self.workers + config.max_queue_size
+        self._timeout = config.timeout
+        # Decremented in the thread of executor when the call finishes, even if the request has timed out
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    async def run(self, f: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._in_flight >= self._max_in_flight:
+                raise HTTPException(status_code=503, detail='Too many requests in queue',
+                                    headers={'Retry-After': '1'})
+            self._in_flight += 1
+        future = self._executor.submit(f, *args)
+        future.add_done_callback(self._on_done)
+        try:
+            # Cancels the call on timeout if it hasn't started yet
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail='Request timed out', headers={'Retry-After': '1'})
+
+    def _on_done(self, _) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+
+class MicroBatcher:
+    """Gathers items of concurrent calls into one batch processed by `f` in the executor
+
+    A batch is sent when it has `max_size` items or after `max_wait` seconds. If there is an idle worker, the batch is
+    sent on the next iteration of the event loop, so batching doesn't add latency under low load. If `f` fails on
+    the batch of several calls, items of every call are processed again separately, so that one caller's input
+    doesn't fail other calls.
+    """
+
+    def __init__(self, executor: BoundedExecutor, f: Callable[[List], List], max_size: int, max_wait: float):
+        self._executor = executor
+        self._f = f
+        self._max_size = max_size
+        self._max_wait = max_wait
+        self._pending: List[Tuple[List, asyncio.Future]] = []
+        self._pending_size = 0
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._running_batches = 0
+
+    async def run(self, items: List) -> List:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((items, future))
+        self._pending_size += len(items)
+        if self._pending_size >= self._max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            delay = self._max_wait if self._running_batches >= self._executor.workers else 0
+            self._flush_handle = loop.call_later(delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch = self._pending
+        self._pending = []
+        self._pending_size = 0
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[List, asyncio.Future]]) -> None:
+        self._running_batches += 1
+        try:
+            results = await self._executor.run(self._f, [item for items, _ in batch for item in items])
+        except HTTPException as e:
+            # Executor is overloaded, retrying would only add load
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except Exception as e:
+            if len(batch) > 1:
+                for call in batch:
+                    asyncio.ensure_future(self._run_batch([call]))
+            else:
+                [(_, future)] = batch
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._running_batches -= 1
+        start = 0
+        for items, future in batch:
+            if not future.done():
+                future.set_result(results[start:start + len(items)])
+            start += len(items)
+
+
+def load_config() -> Config:
     app_dirs = AppDirs(APP_NAME)
     config_path = pathlib.Path(app_dirs.user_config_dir) / 'web-config.yaml'
     with suppress(FileExistsError):
         DEFAULT_CONFIG.to_yaml(config_path, exist_ok=False)
-    return ProfanityFilter.from_yaml(config_path)
+    return Config.from_yaml(config_path)
+
+
+def create_profanity_filter(config: Config = None) -> ProfanityFilter:
+    if config is None:
+        config = load_config()
+    return ProfanityFilter.from_config(config)
 
 
 app = FastAPI()
-pf = create_profanity_filter()
+config = load_config()
+pf = create_profanity_filter(config)
+# Load models and dictionaries before forking workers, so that workers share them
+pf.warm_up()
+executor = BoundedExecutor(config.web)
+
+
+def censor_words_in_worker(words: List[str]) -> List[Word]:
+    return [pf.censor_word(word) for word in words]
+
+
+def censor_many_in_worker(texts: List[str]) -> List[CensorResult]:
+    return [CensorResult(uncensored=censored_text.uncensored, censored=censored_text.censored,
+                         is_profane=censored_text.is_profane, spans=censored_text.spans)
+            for censored_text in pf.censor_many_with_spans(texts)]
+
+
+words_batcher = MicroBatcher(executor, censor_words_in_worker, max_size=config.web.batch_max_size,
+                             max_wait=config.web.batch_max_wait_ms / 1000)
+texts_batcher = MicroBatcher(executor, censor_many_in_worker, max_size=config.web.batch_max_size,
+                             max_wait=config.web.batch_max_wait_ms / 1000)
+
+
+def parse_line(line: bytes) -> Union[str, LineError]:
+    try:
+        text = json.loads(line.decode('utf8'))
+    except ValueError as e:
+        return LineError(error=f'Invalid JSON: {e}')
+    if not isinstance(text, str):
+        return LineError(error='Expected JSON string')
+    return text
+
+
+async def censor_lines(lines: List[bytes]) -> AsyncIterable[str]:
+    """Censors NDJSON lines of texts, yields NDJSON lines of results (errors for lines that aren't JSON strings)"""
+    items = [parse_line(line) for line in lines if line.strip()]
+    for batch in chunked(items, STREAM_BATCH_SIZE):
+        texts = [item for item in batch if isinstance(item, str)]
+        results = iter(await texts_batcher.run(texts) if texts else [])
+        for item in batch:
+            yield (next(results) if isinstance(item, str) else item).json() + '\n'
+
+
+async def censor_stream(chunks: AsyncIterable[bytes]) -> AsyncIterable[str]:
+    """Censors complete lines as soon as they are received"""
+    tail = b''
+    async for chunk in chunks:
+        *lines, tail = (tail + chunk).split(b'\n')
+        async for line in censor_lines(lines):
+            yield line
+    async for line in censor_lines([tail]):
+        yield line
 
 
 @app.post(path='/censor-word/{word}', response_model=Word)
 async def censor_word(word: str = Path(..., title='Word to censor', description='Word to censor')):
-    return pf.censor_word(word)
+    [result] = await words_batcher.run([word])
+    return result
+
+
+@app.post(path='/censor', response_model=List[CensorResult])
+async def censor(texts: List[str] = Body(..., title='Texts to censor', description='JSON array of texts to censor')):
+    return await texts_batcher.run(texts)
+
+
+@app.post(path='/censor-stream')
+async def censor_ndjson(request: Request):
+    """Censors NDJSON stream of texts (JSON string per line) and streams results (JSON object per line) in order"""
+    return NDJSONStreamingResponse(censor_stream(request.stream()))
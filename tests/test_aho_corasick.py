@@ -0,0 +1,10 @@
+from profanity_filter.aho_corasick import AhoCorasickAutomaton
+
+
+def test_aho_corasick_automaton():
+    automaton = AhoCorasickAutomaton(words=['he', 'she', 'his', 'hers', 'she'])
+    assert len(automaton) == 4
+    assert sorted(automaton.iter_matches('uSHErs')) == [(1, 4), (2, 4), (2, 6)]
+    assert automaton.has_match('ahishers')
+    assert not automaton.has_match('hi t-h-e-r-e')
+    assert not AhoCorasickAutomaton().has_match('anything')
@@ -0,0 +1,38 @@
+from math import floor
+
+from profanity_filter.bigram_index import BigramIndex
+from profanity_filter.deletion_index import DeletionIndex
+
+
+def get_max_distance(length: int) -> int:
+    return min(3, floor(0.34 * length))
+
+
+def test_bigram_index_finds_all_fuzzy_matches():
+    words = ['fuck', 'shit', 'bullshit', 'ass', 'dick']
+    index = BigramIndex(words)
+    text = 'iloveshiiitandbulshitfromfukcassessment'
+    candidates = index.find_candidates(text, get_max_distance=get_max_distance)
+    for start in range(len(text)):
+        for finish in range(start + 1, len(text) + 1):
+            part = text[start:finish]
+            max_distance = get_max_distance(len(part))
+            # noinspection PyProtectedMember
+            if any(DeletionIndex._get_distance(part, word, max_distance=max_distance) <= max_distance
+                   for word in words):
+                assert (start, finish) in candidates
+    assert len(candidates) < len(text) * (len(text) + 1) // 4
+    assert (0, 5) not in candidates  # ilove
+
+
+def test_bigram_index_add_and_remove():
+    index = BigramIndex(['shit'])
+    assert (0, 4) in index.find_candidates('shit', get_max_distance=get_max_distance)
+    assert not index.find_candidates('fuck', get_max_distance=get_max_distance)
+    index.add('fuck')
+    assert (0, 4) in index.find_candidates('fuck', get_max_distance=get_max_distance)
+    index.remove('shit')
+    assert 'shit' not in index and len(index) == 1
+    assert not index.find_candidates('shit', get_max_distance=get_max_distance)
+    index.remove('fuck')
+    assert not index.find_candidates('fuck', get_max_distance=get_max_distance)
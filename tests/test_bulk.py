@@ -0,0 +1,65 @@
+import io
+import json
+
+import pytest
+
+from profanity_filter.bulk import censor_bulk, Progress
+from profanity_filter.types_ import ProfanityFilterError
+from tests.conftest import with_config, Config as TestConfig
+
+
+@with_config(TestConfig())
+def test_censor_bulk_json_lines(pf, tmp_path):
+    source = tmp_path / 'comments.jsonl'
+    output = tmp_path / 'censored.jsonl'
+    checkpoint = tmp_path / 'checkpoint.json'
+    source.write_text(''.join(json.dumps({'id': i, 'text': text}) + '\n'
+                              for i, text in enumerate(['That is bullshit!', 'Nice', 'turd'])))
+    assert censor_bulk(pf, str(source), output, column='text', processes=1, chunk_size=2,
+                       checkpoint_path=checkpoint) == 3
+    expected = [{'id': 0, 'text': 'That is ********!'}, {'id': 1, 'text': 'Nice'}, {'id': 2, 'text': '****'}]
+    assert [json.loads(line) for line in output.read_text().splitlines()] == expected
+
+    # Resume: new records are appended, records after the checkpoint are written again
+    with open(str(source), 'a') as f:
+        f.write(json.dumps({'id': 3, 'text': 'shit'}) + '\n')
+    with open(str(output), 'a') as f:
+        f.write('{"id": 3, "text": "not checkpointed"}\n')
+    assert censor_bulk(pf, str(source), output, column='text', processes=1, checkpoint_path=checkpoint) == 4
+    expected.append({'id': 3, 'text': '****'})
+    assert [json.loads(line) for line in output.read_text().splitlines()] == expected
+
+
+@with_config(TestConfig())
+def test_censor_bulk_json_lines_with_invalid_records(pf, tmp_path):
+    source = tmp_path / 'comments.jsonl'
+    output = tmp_path / 'censored.jsonl'
+    for invalid_line, message in [('{"id": 1}', "No column 'text' at line 2"),
+                                  ('["shit"]', "No column 'text' at line 2"),
+                                  ('{"id": 1, "text": null}', "Column 'text' is not a string at line 2"),
+                                  ('{"id": 1, "text": 42}', "Column 'text' is not a string at line 2"),
+                                  ('{"id": 1, "text"', 'Invalid JSON at line 2')]:
+        source.write_text(json.dumps({'id': 0, 'text': 'shit'}) + '\n' + invalid_line + '\n')
+        with pytest.raises(ProfanityFilterError, match=message):
+            censor_bulk(pf, str(source), output, column='text', processes=1)
+
+
+@with_config(TestConfig())
+def test_classify_bulk_files(pf, tmp_path):
+    (tmp_path / 'a.txt').write_text('shit happens')
+    (tmp_path / 'b.txt').write_text('ok')
+    output = tmp_path / 'flags.jsonl'
+    censor_bulk(pf, str(tmp_path / '*.txt'), output, classify=True, processes=1)
+    assert [json.loads(line)['is_profane'] for line in output.read_text().splitlines()] == [True, False]
+
+
+@with_config(TestConfig())
+def test_censor_bulk_progress_counts_written_records(pf, tmp_path):
+    source = tmp_path / 'comments.jsonl'
+    output = tmp_path / 'censored.jsonl'
+    source.write_text(''.join(json.dumps({'text': text}) + '\n' for text in ['shit'] * 5) + '{}\n')
+    progress = Progress(stream=io.StringIO())
+    with pytest.raises(ProfanityFilterError):
+        censor_bulk(pf, str(source), output, column='text', processes=1, chunk_size=2, progress=progress)
+    assert progress.records == len(output.read_text().splitlines())
+    assert progress.bytes == progress.records * len('shit')
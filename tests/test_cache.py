@@ -0,0 +1,149 @@
+from time import sleep
+
+import pytest
+
+from profanity_filter.cache import LocalWordsCache, RedisWordsCache, LRUCache, SubstringIndexCache, CacheStats
+from profanity_filter.types_ import Word
+
+
+@pytest.fixture(params=['local', 'redis'])
+def words_cache(request):
+    if request.param == 'local':
+        return LocalWordsCache()
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisWordsCache(fakeredis.FakeStrictRedis(), sync_interval=0)
+
+
+def test_lru_cache():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats == CacheStats(hits=3, misses=1, evictions=1)
+    assert cache.stats.hit_rate == 0.75
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(ttl=0.01)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    sleep(0.02)
+    assert cache.get('a') is None
+    assert cache.stats == CacheStats(hits=1, misses=1, evictions=1)
+
+
+def test_substring_index_cache():
+    cache = SubstringIndexCache(max_entries=4)
+    for word in ['hello', 'world', 'foo', 'bar', 'baz']:
+        cache.add(word)
+    assert len(cache) == 4
+    assert not cache.contains_substring('ell') and cache.contains_substring('orl')
+    assert cache.contains_substring('fo') and cache.contains_substring('az')
+    assert cache.stats == CacheStats(hits=3, misses=1, evictions=1)
+    cache.remove_where(lambda word: word.startswith('b'))
+    assert len(cache) == 2 and not cache.contains_substring('az') and 'world' in cache
+
+    cache = SubstringIndexCache(ttl=0.01)
+    cache.add('hello')
+    assert cache.contains_substring('ell')
+    sleep(0.02)
+    assert not cache.contains_substring('ell')
+    assert 'hello' not in cache
+
+
+def test_local_words_cache_drop_words():
+    words_cache = LocalWordsCache()
+    words_cache.save_censored_word(Word(uncensored='fuck', censored='****', original_profane_word='fuck'))
+    words_cache.save_censored_word(Word(uncensored='shit', censored='****', original_profane_word='shit'))
+    words_cache.save_word_with_no_profanity_inside('hellooo')
+    words_cache.save_word_with_no_profanity_inside('world')
+    words_cache.drop_words(censored_words=lambda word: word.original_profane_word == 'shit',
+                           words_with_no_profanity_inside=lambda word: 'orl' in word)
+    assert words_cache.get_censored_word('fuck') is not None
+    assert words_cache.get_censored_word('shit') is None
+    assert words_cache.has_no_profanity(['hello'])
+    assert not words_cache.has_no_profanity(['world'])
+
+
+def test_words_cache(words_cache):
+    fuck_word = Word(uncensored='fuck', censored='****', original_profane_word='fuck')
+    world_word = Word(uncensored='world', censored='world')
+    assert words_cache.get_censored_word('fuck') is None
+    words_cache.save_censored_word(fuck_word)
+    words_cache.save_censored_word(world_word)
+    assert words_cache.get_censored_word('fuck') == fuck_word
+    assert words_cache.get_censored_word('world') == world_word
+    assert not words_cache.has_no_profanity(['hello'])
+    words_cache.save_word_with_no_profanity_inside('hellooo')
+    assert words_cache.has_no_profanity(['abc', 'hello'])
+    words_cache.clear(namespace='changed')
+    assert words_cache.get_censored_word('fuck') is None
+    assert not words_cache.has_no_profanity(['hello'])
+
+
+def test_redis_words_cache_batch():
+    fakeredis = pytest.importorskip('fakeredis')
+    redis = fakeredis.FakeStrictRedis()
+    cache, other_cache = RedisWordsCache(redis), RedisWordsCache(redis, sync_interval=0)
+    fuck_word = Word(uncensored='fuck', censored='****', original_profane_word='fuck')
+    other_cache.save_censored_word(fuck_word)
+    with cache.batch(['fuck', 'shit']):
+        # Lookups of words from the batch don't hit Redis
+        # noinspection PyProtectedMember
+        assert redis.delete(cache._get_censored_word_key('fuck')) == 1
+        assert cache.get_censored_word('fuck') == fuck_word
+        assert cache.get_censored_word('shit') is None
+        cache.save_censored_word(fuck_word)
+        cache.save_word_with_no_profanity_inside('hello')
+        assert cache.has_no_profanity(['hell'])
+        assert not other_cache.has_no_profanity(['hell'])
+    assert other_cache.get_censored_word('fuck') == fuck_word
+    assert other_cache.has_no_profanity(['hell'])
+    other_cache.clear(namespace='changed')
+    assert not other_cache.has_no_profanity(['hell'])
+    assert other_cache.get_censored_word('fuck') is None
+    with cache.batch([]):
+        assert cache.has_no_profanity(['hell'])
+
+
+def test_redis_words_cache_namespace():
+    fakeredis = pytest.importorskip('fakeredis')
+    redis = fakeredis.FakeStrictRedis()
+    cache, other_cache = RedisWordsCache(redis, namespace='a', ttl=100), RedisWordsCache(redis, namespace='b')
+    cache.save_censored_word(Word(uncensored='fuck', censored='****', original_profane_word='fuck'))
+    cache.save_word_with_no_profanity_inside('hello')
+    assert other_cache.get_censored_word('fuck') is None
+    assert not other_cache.has_no_profanity(['hell'])
+    assert all(0 < redis.ttl(key) <= 100 for key in redis.keys())
+
+
+def test_redis_words_cache_drop_words():
+    fakeredis = pytest.importorskip('fakeredis')
+    redis = fakeredis.FakeStrictRedis()
+    cache, other_cache = RedisWordsCache(redis, sync_interval=0), RedisWordsCache(redis, sync_interval=0)
+    other_namespace_cache = RedisWordsCache(redis, namespace='other', sync_interval=0)
+    for words_cache in (cache, other_namespace_cache):
+        words_cache.save_censored_word(Word(uncensored='fuck', censored='****', original_profane_word='fuck'))
+        words_cache.save_censored_word(Word(uncensored='shit', censored='****', original_profane_word='shit'))
+        words_cache.save_word_with_no_profanity_inside('hellooo')
+        words_cache.save_word_with_no_profanity_inside('world')
+    assert other_cache.has_no_profanity(['hello'])
+    cache.drop_words(censored_words=lambda word: word.original_profane_word == 'shit',
+                     words_with_no_profanity_inside=lambda word: 'orl' in word)
+    for words_cache in (cache, other_cache):
+        assert words_cache.get_censored_word('fuck') is not None
+        assert words_cache.get_censored_word('shit') is None
+        # The list of words with no profanity inside is dropped as a whole
+        assert not words_cache.has_no_profanity(['world'])
+        assert not words_cache.has_no_profanity(['hello'])
+    # Other namespaces are kept
+    assert other_namespace_cache.get_censored_word('shit') is not None
+    assert other_namespace_cache.has_no_profanity(['world'])
+    cache.save_word_with_no_profanity_inside('hellooo')
+    assert other_cache.has_no_profanity(['hello'])
+    cache.drop_words(censored_words=lambda word: False, words_with_no_profanity_inside=lambda word: False)
+    assert other_cache.has_no_profanity(['hello'])
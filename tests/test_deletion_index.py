@@ -0,0 +1,18 @@
+from profanity_filter.deletion_index import DeletionIndex
+
+
+def test_deletion_index():
+    index = DeletionIndex(['fuck', 'shit', 'bullshit'], max_distance=2)
+    assert len(index) == 3 and 'shit' in index
+    assert index.lookup('fuck', max_distance=0) == ['fuck']
+    assert index.lookup('fukc', max_distance=1) == []
+    assert index.lookup('fukc', max_distance=2) == ['fuck']
+    assert index.lookup('shiit', max_distance=1) == ['shit']
+    assert index.lookup('bulshit', max_distance=2) == ['bullshit']
+    # Max distance is limited by the one of the index
+    assert index.lookup('xxxxxxxx', max_distance=10) == []
+    index.add('shot')
+    assert index.lookup('shat', max_distance=1) == ['shit', 'shot']
+    index.remove('shit')
+    assert index.lookup('shat', max_distance=1) == ['shot']
+    assert 'shit' not in index
@@ -1,3 +1,4 @@
+import pickle
 import uuid
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -6,8 +7,10 @@ import pytest
 from ordered_set import OrderedSet
 from ruamel.yaml import YAML
 
-from profanity_filter.profanity_filter import ProfanityFilter, DEFAULT_CONFIG
-from profanity_filter.types_ import Word, AnalysisType
+from profanity_filter import spacy_utlis
+from profanity_filter.profanity_filter import ProfanityFilter, DEFAULT_CONFIG, DETECTION_CHUNK_SIZE
+from profanity_filter.types_ import Word, AnalysisType, CensoredSpan, CensoredText, FuzzyBackend, ProfanityFilterError
+from profanity_filter.compiled_dictionaries import CompiledDictionaries
 from profanity_filter.config import Config
 
 from tests.conftest import (create_profane_word_dictionaries, TEST_STATEMENT, CLEAN_STATEMENT, with_config,
@@ -16,10 +19,16 @@ from tests.conftest import (create_profane_word_dictionaries, TEST_STATEMENT, CL
 
 def compare_settings(pf0: ProfanityFilter, pf1: ProfanityFilter) -> None:
     assert pf0.analyses == pf1.analyses
+    assert pf0.cache_max_entries == pf1.cache_max_entries
     assert pf0.cache_redis_connection_url == pf1.cache_redis_connection_url
+    assert pf0.cache_redis_ttl == pf1.cache_redis_ttl
+    assert pf0.cache_ttl == pf1.cache_ttl
     assert pf0.censor_char == pf1.censor_char
+    assert pf0.compiled_dictionaries_path == pf1.compiled_dictionaries_path
     assert pf0.custom_profane_word_dictionaries == pf1.custom_profane_word_dictionaries
+    assert pf0.exact_match_prefilter == pf1.exact_match_prefilter
     assert pf0.extra_profane_word_dictionaries == pf1.extra_profane_word_dictionaries
+    assert pf0.fuzzy_backend == pf1.fuzzy_backend
     assert pf0.languages == pf1.languages
     assert pf0.max_relative_distance == pf1.max_relative_distance
 
@@ -46,6 +55,7 @@ def test_from_yaml():
         )
         config_dict = config.dict()
         config_dict['analyses'] = [analysis.value for analysis in config_dict['analyses']]
+        config_dict['fuzzy_backend'] = config_dict['fuzzy_backend'].value
         yaml = YAML(typ='safe')
         yaml.dump(data=config_dict, stream=Path(f.name))
         compare_settings(ProfanityFilter.from_config(config), ProfanityFilter.from_yaml(f.name))
@@ -67,12 +77,80 @@ def test_is_profane(pf):
     assert not pf.is_profane(CLEAN_STATEMENT)
 
 
+@with_config(TestConfig())
+def test_is_profane_stops_on_first_profane_word(pf, monkeypatch):
+    parsed = []
+    parse = pf._parse
+
+    def parse_and_save(language, text, **kwargs):
+        parsed.append(text)
+        return parse(language=language, text=text, **kwargs)
+
+    monkeypatch.setattr(pf, '_parse', parse_and_save)
+    assert pf.is_profane('That is bullshit! ' + CLEAN_STATEMENT * 1000)
+    assert len(parsed) == 1 and len(parsed[0]) <= DETECTION_CHUNK_SIZE + len(CLEAN_STATEMENT)
+    assert not pf.is_profane(CLEAN_STATEMENT * 1000)
+
+
+@with_config(TestConfig())
+def test_censor_many(pf):
+    texts = [TEST_STATEMENT, CLEAN_STATEMENT, '', 'turd', TEST_STATEMENT]
+    assert pf.censor_many(texts) == [pf.censor(text) for text in texts]
+    assert pf.censor_many(texts, batch_size=2) == [pf.censor(text) for text in texts]
+    assert pf.censor_many(iter([])) == []
+
+
+@with_config(TestConfig())
+def test_censor_with_spans(pf):
+    censored_text = pf.censor_with_spans('What a  bullshit\tand turd!')
+    assert censored_text.censored == 'What a  ********\tand ****!'
+    assert censored_text.is_profane
+    assert censored_text.spans == [
+        CensoredSpan(start=8, end=16, censored='********', original_profane_word='bullshit'),
+        CensoredSpan(start=21, end=25, censored='****', original_profane_word='turd'),
+    ]
+    assert pf.censor_many_with_spans([CLEAN_STATEMENT]) == [CensoredText(uncensored=CLEAN_STATEMENT,
+                                                                          censored=CLEAN_STATEMENT)]
+
+
+@with_config(TestConfig())
+def test_censor_stream(pf):
+    chunks = ['What a  bulls', 'hit\tand t', 'urd', '!', '\n']
+    assert ''.join(pf.censor_stream(chunks, buffer_size=5)) == 'What a  ********\tand ****!\n'
+    assert ''.join(pf.censor_stream(iter(chunks))) == 'What a  ********\tand ****!\n'
+    assert list(pf.censor_stream([])) == []
+
+
+@with_config(TestConfig())
+def test_is_profane_many(pf):
+    texts = [TEST_STATEMENT, CLEAN_STATEMENT, '', 'turd', TEST_STATEMENT]
+    assert pf.is_profane_many(texts) == [True, False, False, True, True]
+    assert pf.is_profane_many(texts, batch_size=1) == [True, False, False, True, True]
+
+
+@with_config(TestConfig())
+def test_pool(pf):
+    texts = [TEST_STATEMENT, CLEAN_STATEMENT, '', 'turd'] * 5
+    with pf.pool(processes=2, chunk_size=3) as pool:
+        assert pool.censor_many(texts) == pf.censor_many(texts)
+        assert pool.is_profane_many(texts, chunk_size=7) == pf.is_profane_many(texts)
+
+
 @with_config(TestConfig())
 def test_is_clean(pf):
     assert not pf.is_clean(TEST_STATEMENT)
     assert pf.is_clean(CLEAN_STATEMENT)
 
 
+@with_config(TestConfig())
+def test_cache_max_entries(pf):
+    pf.cache_max_entries = 2
+    assert pf.cache_max_entries == 2
+    for word in ['fuck', 'shit', 'turd', 'fuck']:
+        assert pf.censor_word(word).is_profane
+    assert pf.cache_stats['censored_words'].evictions == 2
+
+
 @with_config(TestConfig())
 def test_censor_char(pf):
     assert pf.censor_char == '*'
@@ -122,6 +200,149 @@ def test_tokenization(pf):
     assert pf.censor(TEST_STATEMENT) == "Hey, I like unicorns, *********, oranges and man's blood, turd!"
 
 
+@with_config(TestConfig())
+def test_exact_match_prefilter(pf, monkeypatch):
+    censored = pf.censor(TEST_STATEMENT)
+    pf.exact_match_prefilter = True
+    assert pf.exact_match_prefilter
+    assert pf.censor(TEST_STATEMENT) == censored
+    assert pf.censor('What a  bullshit\tand turd!') == 'What a  ********\tand ****!'
+    # Texts without exact matches are not parsed at all
+    monkeypatch.setattr(pf, '_parse_many', None)
+    assert pf.censor(CLEAN_STATEMENT) == CLEAN_STATEMENT
+    assert pf.is_clean(CLEAN_STATEMENT)
+
+
+@with_config(TestConfig())
+def test_compiled_dictionaries_path(pf, tmp_path, monkeypatch):
+    path = tmp_path / 'dictionaries.bin'
+    pf.compiled_dictionaries_path = path
+    assert path.is_file()
+    pf_loaded = ProfanityFilter(compiled_dictionaries_path=path)
+    assert pf_loaded.profane_word_dictionaries == pf.profane_word_dictionaries
+    # Dictionaries are neither recompiled on clearing cache nor on loading from the file with the same settings
+    monkeypatch.setattr(ProfanityFilter, '_compile_dictionaries', None)
+    pf_loaded.clear_cache()
+    assert ProfanityFilter(compiled_dictionaries_path=path).censor(TEST_STATEMENT) == pf.censor(TEST_STATEMENT)
+    monkeypatch.undo()
+    # Stale file is recompiled
+    pf_loaded.extra_profane_word_dictionaries = {'en': ['chocolate']}
+    assert ProfanityFilter(compiled_dictionaries_path=path,
+                           extra_profane_word_dictionaries={'en': ['chocolate']}).censor_word('chocolate').censored \
+        == '*********'
+    # Empty or partially written file is compiled again
+    data = path.read_bytes()
+    for broken_data in [b'', data[:len(data) // 2]]:
+        path.write_bytes(broken_data)
+        assert ProfanityFilter(compiled_dictionaries_path=path).censor(TEST_STATEMENT) == pf.censor(TEST_STATEMENT)
+        assert CompiledDictionaries.load(path) is not None
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@with_config(TestConfig())
+def test_compiled_dictionaries_path_with_broken_payload(pf, tmp_path):
+    path = tmp_path / 'dictionaries.bin'
+    key = 'key'.encode('utf8')
+    # noinspection PyProtectedMember
+    header = CompiledDictionaries._HEADER.pack(CompiledDictionaries.MAGIC, CompiledDictionaries.VERSION, len(key))
+    payloads = [
+        b'garbage',
+        pickle.dumps((1, 2, 3, 4, 5, 6))[:-3],
+        # Pickles of classes that were moved or renamed
+        b'cno_such_module\nNoSuchClass\n.',
+        b'cprofanity_filter.compiled_dictionaries\nNoSuchClass\n.',
+        pickle.dumps(()),
+    ]
+    for payload in payloads:
+        path.write_bytes(header + key + payload)
+        assert CompiledDictionaries.load(path) is None
+        assert ProfanityFilter(compiled_dictionaries_path=path).censor(TEST_STATEMENT) == pf.censor(TEST_STATEMENT)
+    # Unreadable file is a miss too
+    assert CompiledDictionaries.load(tmp_path) is None
+    assert ProfanityFilter(compiled_dictionaries_path=tmp_path).censor(TEST_STATEMENT) == pf.censor(TEST_STATEMENT)
+
+
+def test_warm_up():
+    pf = ProfanityFilter(languages=['en'])
+    # noinspection PyProtectedMember
+    assert not pf._nlps
+    pf.warm_up()
+    # noinspection PyProtectedMember
+    assert list(pf._nlps) == ['en'] and 'profane_word_dictionaries' in pf.__dict__
+
+
+@with_config(TestConfig())
+def test_update(pf, monkeypatch):
+    update_profane_word_dictionaries_calls = []
+    update_profane_word_dictionaries = pf._update_profane_word_dictionaries
+    monkeypatch.setattr(pf, '_update_profane_word_dictionaries',
+                        lambda: update_profane_word_dictionaries_calls.append(update_profane_word_dictionaries()))
+    # Changing censoring settings doesn't touch dictionaries
+    pf.update(censor_char='#', max_relative_distance=0.5)
+    assert not update_profane_word_dictionaries_calls
+    assert (pf.censor_char, pf.max_relative_distance) == ('#', 0.5)
+    assert pf.censor_word('fuck').censored == '####'
+    # Dictionaries are rebuilt once for all changes
+    with pf.batch_config():
+        pf.extra_profane_word_dictionaries = {'en': ['chocolate']}
+        pf.exact_match_prefilter = True
+        assert pf.censor_word('chocolate').censored == 'chocolate'
+    assert len(update_profane_word_dictionaries_calls) == 1
+    assert pf.censor_word('chocolate').censored == '#########'
+    with pytest.raises(TypeError):
+        pf.update(censor_character='*')
+    # Invalid update changes nothing
+    with pytest.raises(ValueError):
+        pf.update(censor_whole_words=False, censor_char='##')
+    assert pf.censor_whole_words and pf.censor_char == '#'
+    with pytest.raises(ProfanityFilterError):
+        pf.update(languages=['xx'], censor_char='$')
+    assert list(pf.languages) == ['en'] and pf.censor_char == '#'
+    assert pf.censor_word('chocolate').censored == '#########'
+
+
+@with_config(TestConfig())
+def test_add_and_remove_words(pf, monkeypatch):
+    pf.exact_match_prefilter = True
+    assert pf.censor('I like chocolate') == 'I like chocolate'
+    assert pf.censor_word('shit').censored == '****'
+    # Dictionaries are not recompiled
+    monkeypatch.setattr(pf, '_compile_dictionaries', None)
+    pf.add_words('en', ['chocolate'])
+    assert pf.extra_profane_word_dictionaries['en'] == OrderedSet(['chocolate'])
+    assert pf.censor('I like chocolate') == 'I like *********'
+    pf.remove_words('en', ['chocolate', 'fuck'])
+    assert 'chocolate' not in pf.extra_profane_word_dictionaries['en']
+    assert pf.removed_profane_words['en'] == OrderedSet(['chocolate', 'fuck'])
+    assert not pf.custom_profane_word_dictionaries
+    assert pf.censor('I like chocolate') == 'I like chocolate'
+    assert pf.censor_word('fuck').censored == 'fuck'
+    # Unaffected words stay in the cache
+    assert pf._words_cache.get_censored_word('shit') is not None
+    pf.clear_cache()
+    assert pf.censor_word('fuck').censored == 'fuck'
+    pf.add_words('en', ['fuck'])
+    assert pf.censor_word('fuck').censored == '****'
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_add_words_with_deep_analysis(pf):
+    assert pf.censor_word('shit').censored == '****'
+    pf.add_words('en', ['chocolate'])
+    # Stems of cached words may contain the added words, so the whole cache is dropped
+    assert pf._words_cache.get_censored_word('shit') is None
+    assert pf.censor_word('chocolate').censored == '*********'
+
+
+@with_config(TestConfig())
+def test_remove_words_keeps_other_languages(pf):
+    pf.remove_words('en', ['turd'])
+    pf.languages = ['en', 'ru']
+    assert 'turd' not in pf.profane_word_dictionaries['en']
+    assert 'fuck' in pf.profane_word_dictionaries['en']
+    assert pf.profane_word_dictionaries['ru']
+
+
 @with_config(TestConfig())
 def test_without_deep_analysis(pf):
     assert pf.censor_word('mulkku0') == Word(uncensored='mulkku0', censored='mulkku0')
@@ -166,6 +387,99 @@ def test_deep_analysis_tokenization_and_keep_only_letters(nlp):
     assert doc[2]._.original_profane_word is None
 
 
+@with_config(TestConfig())
+def test_lemmatization(pf):
+    assert pf.censor_word('fucks') == Word(uncensored='fucks', censored='*****', original_profane_word='fuck')
+    assert pf.censor("Don't be fucking rude") == "Don't be ******* rude"
+    nlp = pf._get_nlp('en')
+    assert spacy_utlis.lemmatize(nlp, 'mice') == 'mouse'
+    assert spacy_utlis.lemmatize(nlp, 'asss') == 'asss'
+    assert spacy_utlis.lemmatize(nlp, 'jums') == 'jums'
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_fuzzy_matches_are_memoized(pf):
+    assert pf.censor_word('oofuko').censored == '******'
+    misses = pf.cache_stats['fuzzy_matches'].misses
+    assert misses
+    # noinspection PyProtectedMember
+    pf._words_cache.clear()
+    assert pf.censor_word('oofuko').censored == '******'
+    assert pf.cache_stats['fuzzy_matches'].misses == misses
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_spell_results_are_memoized(pf):
+    assert pf.censor_word('oofuko').censored == '******'
+    spell_misses, stem_misses = pf.cache_stats['spell'].misses, pf.cache_stats['stem'].misses
+    assert spell_misses and stem_misses
+    # noinspection PyProtectedMember
+    pf._words_cache.clear()
+    assert pf.censor_word('oofuko').censored == '******'
+    assert pf.cache_stats['spell'].misses == spell_misses
+    assert pf.cache_stats['stem'].misses == stem_misses
+    assert pf.cache_stats['spell'].hits
+    pf.spells = dict(pf.spells)
+    # noinspection PyProtectedMember
+    assert not len(pf._spell_results) and not len(pf._stem_results)
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_symspell_backend(pf):
+    pf.fuzzy_backend = FuzzyBackend.SYMSPELL
+    assert pf.censor_word('shiiit') == Word(uncensored='shiiit', censored='******', original_profane_word='shit')
+    assert not pf.censor_word('world').is_profane
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_backends_order_matches_the_same_way(pf):
+    words = ['shiiit', 'fuk', 'duck', 'bich', 'ass', 'mulkku0']
+
+    def get_fuzzy_matches():
+        # noinspection PyProtectedMember
+        return [pf._get_fuzzy_matches(language='en', word=word, compiled_dictionaries=pf._get_compiled_dictionaries())
+                for word in words]
+
+    trie_matches = get_fuzzy_matches()
+    pf.fuzzy_backend = FuzzyBackend.SYMSPELL
+    assert get_fuzzy_matches() == trie_matches
+    assert any(len(matches) > 1 for matches in trie_matches)
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_skips_unmatchable_substrings(pf, monkeypatch):
+    analyzed = []
+    censor_word_part = pf._censor_word_part
+
+    def analyze_and_save(language, word):
+        analyzed.append(word.text)
+        return censor_word_part(language=language, word=word)
+
+    monkeypatch.setattr(pf, '_censor_word_part', analyze_and_save)
+    word = 'ilovethisbeautifulweatheryesterday'
+    pf.censor_word(word)
+    assert analyzed[0] == word
+    assert len(analyzed) < len(word) * (len(word) + 1) // 2
+    assert 'ilove' not in analyzed
+    assert pf.censor_word('xxxshiiitxxx').censored == '*' * len('xxxshiiitxxx')
+
+
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP]), censor_whole_words=False))
+def test_deep_analysis_skipping_unmatchable_substrings_keeps_results(pf, monkeypatch):
+    words = ['claossickrkaut', 'classifucking', 'ilovethisbeautifulweatheryesterday', 'thisshitisbananas',
+             'throwbackthursdayfuckyeah', 'sunsetlovers0mulkku0']
+    pruned = []
+    for word in words:
+        pf.clear_cache()
+        pruned.append(pf.censor_word(word))
+    assert pruned[0].censored == 'claossic******'
+    assert pruned[1].censored == 'cl********ing'
+    monkeypatch.setattr(pf, '_drop_unmatchable_substrings', lambda language, word, substrings: substrings)
+    for word, censored_word in zip(words, pruned):
+        pf.clear_cache()
+        assert pf.censor_word(word) == censored_word
+
+
 @with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
 def test_deep_analysis_lemmatization(pf):
     assert pf.censor_word('Dick') == Word(uncensored='Dick', censored='****', original_profane_word='dick')
@@ -175,6 +489,13 @@ def test_deep_analysis_lemmatization(pf):
     assert pf.censor_word('fucks') == Word(uncensored='fucks', censored='*****', original_profane_word='fuck')
 
 
+@with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP])))
+def test_deep_analysis_lemmatization_doesnt_depend_on_cached_words(pf):
+    # "ass" must not be taken as lemma of "asss", as it's a part of the cached clean word "gwass"
+    pf.censor('gwass')
+    assert pf.censor('asss') == '****'
+
+
 @with_config(TestConfig(analyses=frozenset([AnalysisType.DEEP]), censor_whole_words=False))
 def test_deep_analysis_with_censor_whole_words_false(pf):
     assert pf.censor_word('mulkku0') == Word(uncensored='mulkku0', censored='******0', original_profane_word='mulkku')
@@ -198,6 +519,28 @@ def test_russian_deep_analysis(pf):
     assert pf.censor_word('бл@ка') == Word(uncensored='бл@ка', censored='*****', original_profane_word='бля')
 
 
+@with_config(TestConfig(languages=('ru', 'en')))
+def test_split_by_language_detects_once_per_script_run(pf, monkeypatch):
+    detected = []
+
+    def detect_languages(text):
+        detected.append(text)
+        return OrderedSet([language for language, alphabet in [('ru', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'),
+                                                                ('en', 'abcdefghijklmnopqrstuvwxyz')]
+                           if any(char in alphabet for char in text.lower())])
+
+    monkeypatch.setattr(pf, '_detect_languages', detect_languages)
+    text = "Да бля, это просто shit какой-то! Really, shit happens."
+    parts = pf._split_by_language(text)
+    assert ''.join(part for _, part in parts) == text
+    assert parts == [('ru', 'Да бля, это просто '), ('en', 'shit '), ('ru', 'какой-то! '),
+                     ('en', 'Really, shit happens.')]
+    assert len(detected) == 5
+    detected.clear()
+    assert pf._split_by_language('Really, shit happens.') == [('en', 'Really, shit happens.')]
+    assert len(detected) == 1
+
+
 @with_config(TestConfig(analyses=frozenset([AnalysisType.MULTILINGUAL]), languages=('ru', 'en')))
 def test_multilingual(pf):
     assert pf.censor("Да бля, это просто shit какой-то!") == "Да ***, это просто **** какой-то!"
@@ -1,5 +1,6 @@
 from itertools import chain
 
+from profanity_filter import spacy_utlis
 from tests.conftest import TEST_STATEMENT, with_config, Config as TestConfig
 
 
@@ -19,3 +20,13 @@ def test_spacy_component(nlp):
     assert doc[-2]._.censored == '****'
     assert doc[-2]._.is_profane
     assert doc[-2]._.original_profane_word == 'turd'
+
+
+@with_config(TestConfig())
+def test_spacy_component_stop_on_first_profane_word(nlp):
+    doc = spacy_utlis.parse(nlp=nlp, text='What a shit and turd!', use_profanity_filter=True,
+                            stop_on_first_profane_word=True)
+    assert doc._.is_profane
+    assert doc[2]._.censored == '****'
+    assert doc[4]._.censored is None
+    assert not doc[4]._.is_profane
@@ -0,0 +1,19 @@
+from itertools import combinations
+
+from profanity_filter.substring_index import SubstringIndex
+
+
+def test_substring_index():
+    words = ['abcbc', 'cbca', 'hello', 'привет']
+    index = SubstringIndex()
+    assert not index.contains_substring('')
+    for word in words:
+        index.add(word)
+    index.add('hello')
+    assert len(index) == len(words)
+    assert 'hello' in index and 'hell' not in index
+    assert set(index) == set(words)
+    candidates = {word[start:finish] for word in words for start, finish in combinations(range(len(word) + 1), 2)}
+    candidates |= {'', 'abca', 'bcbca', 'cbcbc', 'helloo', 'приветы', 'x'}
+    for candidate in candidates:
+        assert index.contains_substring(candidate) == any(candidate in word for word in words), candidate
@@ -0,0 +1,54 @@
+import os
+import shutil
+from time import sleep, time
+
+from tests.conftest import with_config, Config as TestConfig
+
+
+@with_config(TestConfig())
+def test_watch_dictionaries(pf, tmp_path, monkeypatch):
+    words_file = tmp_path / 'en_profane_words.txt'
+    # noinspection PyProtectedMember
+    shutil.copy(str(pf._DATA_DIR / 'en_profane_words.txt'), str(words_file))
+    monkeypatch.setattr(pf, '_DATA_DIR', tmp_path)
+    pf.clear_cache()
+    assert pf.censor('I like chocolate') == 'I like chocolate'
+    assert pf.censor_word('shit').censored == '****'
+
+    with pf.watch_dictionaries(interval=0.01) as watcher:
+        with open(str(words_file), 'a') as f:
+            f.write('chocolate\n')
+        # Modification time may have coarse resolution
+        os.utime(str(words_file), (time(), time() + 1))
+        for _ in range(500):
+            if watcher.reloads:
+                break
+            sleep(0.01)
+        assert watcher.reloads == 1
+        # Dictionaries are swapped in by the censoring thread
+        assert 'chocolate' not in pf.profane_word_dictionaries['en']
+        assert pf.censor('I like chocolate') == 'I like *********'
+        assert 'chocolate' in pf.profane_word_dictionaries['en']
+        # Words that can't be affected by the change stay in the cache
+        # noinspection PyProtectedMember
+        assert pf._words_cache.get_censored_word('shit') is not None
+        assert not watcher.check()
+
+
+@with_config(TestConfig())
+def test_watch_dictionaries_after_unexpected_error(pf, monkeypatch, caplog):
+    errors = [RuntimeError('Unexpected')]
+
+    def reload_dictionaries() -> bool:
+        if errors:
+            raise errors.pop()
+        return True
+
+    monkeypatch.setattr(pf, '_reload_dictionaries', reload_dictionaries)
+    with pf.watch_dictionaries(interval=0.01) as watcher:
+        for _ in range(500):
+            if watcher.reloads:
+                break
+            sleep(0.01)
+        assert watcher.reloads
+    assert "Couldn't reload profane word dictionaries" in caplog.text
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from profanity_filter.config import Config, WebConfig
+
+
+@pytest.fixture(scope='module')
+def web(tmp_path_factory):
+    pytest.importorskip('fastapi')
+    pytest.importorskip('appdirs')
+    config_home = tmp_path_factory.mktemp('config')
+    Config(web=WebConfig(workers=2)).to_yaml(Path(str(config_home)) / 'profanity-filter' / 'web-config.yaml')
+    xdg_config_home = os.environ.get('XDG_CONFIG_HOME')
+    os.environ['XDG_CONFIG_HOME'] = str(config_home)
+    try:
+        from profanity_filter import web
+    finally:
+        if xdg_config_home is None:
+            del os.environ['XDG_CONFIG_HOME']
+        else:
+            os.environ['XDG_CONFIG_HOME'] = xdg_config_home
+    return web
+
+
+@pytest.fixture(scope='module')
+def client(web):
+    from starlette.testclient import TestClient
+    return TestClient(web.app)
+
+
+def test_censor(client):
+    response = client.post('/censor', json=["That's bullshit!", "That's awesome!"])
+    assert response.status_code == 200
+    assert [(result['censored'], result['is_profane']) for result in response.json()] == [
+        ("That's ********!", True), ("That's awesome!", False)]
+    assert response.json()[0]['spans'] == [{'start': 7, 'end': 15, 'censored': '********',
+                                            'original_profane_word': 'bullshit'}]
+
+
+def test_bounded_executor_workers(web):
+    assert web.executor.workers == 2
+
+
+def test_censor_word(client):
+    response = client.post('/censor-word/shit')
+    assert response.status_code == 200
+    assert response.json()['censored'] == '****'
+
+
+def test_censor_stream(client):
+    texts = ["That's bullshit!", '', "That's awesome!", 'turd']
+    response = client.post('/censor-stream', data=''.join(json.dumps(text) + '\n' for text in texts if text))
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert [json.loads(line)['censored'] for line in response.text.splitlines()] == [
+        "That's ********!", "That's awesome!", '****']
+
+
+def test_censor_stream_invalid_lines(client):
+    response = client.post('/censor-stream', data='"shit"\n123\n{not json\n"turd"\n')
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result.get('censored') for result in results] == ['****', None, None, '****']
+    assert results[1] == {'error': 'Expected JSON string'}
+    assert results[2]['error'].startswith('Invalid JSON')
+
+
+def test_micro_batcher_isolates_failing_calls(web):
+    class InlineExecutor:
+        workers = 1
+
+        @staticmethod
+        async def run(f, *args):
+            return f(*args)
+
+    def upper(items):
+        return [item.upper() for item in items]
+
+    batcher = web.MicroBatcher(InlineExecutor(), upper, max_size=10, max_wait=1.0)
+
+    async def run_concurrently():
+        return await asyncio.gather(batcher.run([1]), batcher.run(['a', 'b']), return_exceptions=True)
+
+    loop = asyncio.new_event_loop()
+    try:
+        failed, succeeded = loop.run_until_complete(run_concurrently())
+    finally:
+        loop.close()
+    assert isinstance(failed, AttributeError)
+    assert succeeded == ['A', 'B']